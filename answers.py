@@ -0,0 +1,194 @@
+import argparse
+import csv
+import json
+import re
+import sys
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from skill_vectors import popcount
+
+# ---------------- ANSWER SCORING ----------------
+# Hot Seat answers are tokenized once (lower, non-ASCII punctuation and
+# spaces to " ", byte table for ASCII punctuation, split) and the words are
+# looked up in a precompiled lexicon of weak / strong / STAR terms.
+# Quantified results ("30%", "$2M", "3x", "200 ms") are a regex that starts
+# at the first digit and is skipped for text without one. Words only count
+# on their own, so "just" no longer fires inside "adjusted" nor "led" inside
+# "filled", and "built—and" is two words.
+#
+# Every term owns a bit, so an answer's hits are one uint64 mask. A batch
+# becomes one mask array, and scores, STAR parts and counts are popcounts
+# over it.
+#
+# Verdict rules are unchanged: under 20 characters is weak; each weak term
+# is -10 (the first one is quoted back), each strong term +20; above 10 is
+# strong.
+
+WEAK_WORDS = ["maybe", "think", "probably", "sort of", "just"]
+STRONG_WORDS = ["architected", "designed", "implemented", "optimized", "reduced", "increased", "led", "built"]
+STAR_MARKERS = {
+    "situation": ["situation", "context", "background", "challenge", "problem"],
+    "task": ["task", "goal", "objective", "responsible for", "needed to"],
+    "action": ["action", "approach", "decided to", "i chose"],
+    "result": ["result", "resulted", "outcome", "impact", "as a result"],
+}
+UNITS = ["%", "percent", "x", "k", "m", "ms", "seconds", "minutes", "hours", "days", "weeks",
+         "users", "customers", "requests", "transactions"]
+MIN_LENGTH = 20
+
+# Bytes tokenizer: letters, digits and non-ASCII bytes are kept, everything
+# else becomes a space, so bytes.split() yields bare words. Non-ASCII
+# characters that are not word characters (dashes, curly quotes, "…", no-break
+# spaces) are replaced by a space first, so the non-ASCII bytes left belong
+# to letters
+_NON_WORD = re.compile(r"[^\x00-\x7f\w]")
+_WORD_BYTES = set(b"abcdefghijklmnopqrstuvwxyz0123456789")
+_SPACES = bytes(c if c in _WORD_BYTES or c >= 128 else 32 for c in range(256))
+_NOT_NUMBER = bytes(c for c in range(256) if c not in b"0123456789$")
+
+
+def _normalize(lowered):
+    return lowered if lowered.isascii() else _NON_WORD.sub(" ", lowered)
+
+
+# Per-answer arrays: characters, score, weak / strong term counts, STAR parts
+# present (0-4), quantified result found, and the raw term mask
+AnswerScores = namedtuple("AnswerScores", "length score weak strong star quantified mask")
+
+
+class AnswerLexicon:
+    def __init__(self, weak=WEAK_WORDS, strong=STRONG_WORDS, star=STAR_MARKERS, units=UNITS):
+        self.terms = [" ".join(t.lower().split()) for t in weak] + [" ".join(t.lower().split()) for t in strong]
+        self.weak_mask = (1 << len(weak)) - 1
+        self.strong_mask = ((1 << len(strong)) - 1) << len(weak)
+        # Strong verbs count as the "action" of STAR
+        self.star_masks = {part: self.strong_mask if part == "action" else 0 for part in star}
+        for part, markers in star.items():
+            for marker in markers:
+                self.star_masks[part] |= 1 << len(self.terms)
+                self.terms.append(" ".join(marker.lower().split()))
+        if len(self.terms) > 64:
+            raise ValueError(f"At most 64 lexicon terms, got {len(self.terms)}")
+        # Terms go through the same tokenizer as answers: single words are a
+        # set lookup, phrases a search in the re-joined word list
+        words = [_normalize(t).encode().translate(_SPACES).split() for t in self.terms]
+        self._word_bits = {w[0]: 1 << i for i, w in enumerate(words) if len(w) == 1}
+        self._phrases = [(b" %s " % b" ".join(w), 1 << i) for i, w in enumerate(words) if len(w) > 1]
+        self._phrase_heads = {w[0] for w in words if len(w) > 1}
+        unit = "|".join(re.escape(u) for u in sorted(units, key=len, reverse=True)).encode()
+        self._quantity = re.compile(rb"(?<![a-z0-9_.\x80-\xff])(?:\$\d[\d,.]*\s*[kmb]?|\d[\d,.]*\s*(?:%s))"
+                                    rb"(?![a-z0-9_\x80-\xff])" % unit)
+
+    def _quantified(self, raw):
+        # Only text with a digit or "$" is searched, from the first one
+        numbers = raw.translate(None, _NOT_NUMBER)
+        return bool(numbers) and self._quantity.search(raw, raw.find(numbers[:1])) is not None
+
+    def scan(self, answer):
+        """(term mask, quantified) for one answer."""
+        raw = _normalize(answer.lower()).encode()
+        words = raw.translate(_SPACES).split()
+        mask = 0
+        for word in self._word_bits.keys() & words:
+            mask |= self._word_bits[word]
+        if not self._phrase_heads.isdisjoint(words):
+            joined = b" %s " % b" ".join(words)
+            for phrase, bit in self._phrases:
+                if phrase in joined:
+                    mask |= bit
+        return mask, self._quantified(raw)
+
+    def analyze(self, answer):
+        """(verdict, text, style), as the Hot Seat shows it."""
+        mask, quantified = self.scan(answer)
+        return self.verdict(len(answer), mask, quantified)
+
+    def verdict(self, length, mask, quantified):
+        if length < MIN_LENGTH:
+            return "⚠️ Weak Answer", "Too short. Use the STAR method (Situation, Task, Action, Result).", "weak"
+        weak = mask & self.weak_mask
+        if 20 * (mask & self.strong_mask).bit_count() - 10 * weak.bit_count() > 10:
+            if quantified:
+                return "✅ Strong Answer", "Great use of action verbs and measurable results!", "strong"
+            return "✅ Strong Answer", "Great use of action verbs! Make sure to quantify your results.", "strong"
+        if weak:
+            first = self.terms[(weak & -weak).bit_length() - 1]
+            return "⚠️ Needs Improvement", f"Your answer is passive. Avoid uncertain words like '{first}'. Be confident.", "weak"
+        return "⚠️ Needs Improvement", "Your answer is passive. Focus on the impact of your actions.", "weak"
+
+    def score_many(self, answers):
+        """AnswerScores of arrays, one row per answer."""
+        answers = list(answers)
+        n = len(answers)
+        scanned = list(map(self.scan, answers))
+        lengths = np.fromiter(map(len, answers), dtype=np.int64, count=n)
+        masks = np.fromiter((mask for mask, _ in scanned), dtype=np.uint64, count=n)
+        quantified = np.fromiter((q for _, q in scanned), dtype=bool, count=n)
+        weak = popcount(masks[:, None] & np.uint64(self.weak_mask))
+        strong = popcount(masks[:, None] & np.uint64(self.strong_mask))
+        star = np.zeros(n, dtype=np.int64)
+        for part_mask in self.star_masks.values():
+            star += (masks & np.uint64(part_mask)) != 0
+        return AnswerScores(lengths, 20 * strong - 10 * weak, weak, strong, star, quantified, masks)
+
+    def verdicts(self, scores):
+        """[(verdict, text, style), ...] for the rows of score_many()."""
+        return [self.verdict(int(length), int(mask), bool(q))
+                for length, mask, q in zip(scores.length, scores.mask, scores.quantified)]
+
+    def weak_terms(self, mask):
+        mask = int(mask) & self.weak_mask
+        return [t for i, t in enumerate(self.terms) if mask >> i & 1]
+
+
+_lexicon = None
+
+
+def default_lexicon():
+    global _lexicon
+    if _lexicon is None:
+        _lexicon = AnswerLexicon()
+    return _lexicon
+
+
+def analyze_answer(answer):
+    return default_lexicon().analyze(answer)
+
+
+def score_answers(answers):
+    return default_lexicon().score_many(answers)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score an archive of practice answers.")
+    parser.add_argument("--input", required=True, help='JSONL of {"id", "answer"} per line')
+    parser.add_argument("--out", required=True, help="CSV report")
+    parser.add_argument("--chunk", type=int, default=10000, help="Answers scanned per batch")
+    args = parser.parse_args(argv)
+
+    lexicon = default_lexicon()
+    started, count = time.perf_counter(), 0
+    with open(args.input, encoding="utf-8") as fh, open(args.out, "w", newline="", encoding="utf-8") as out:
+        writer = csv.writer(out)
+        writer.writerow(["id", "style", "score", "star_parts", "quantified", "weak_words"])
+        rows = (json.loads(line) for line in fh if line.strip())
+        while True:
+            chunk = [row for _, row in zip(range(args.chunk), rows)]
+            if not chunk:
+                break
+            scores = lexicon.score_many(row["answer"] for row in chunk)
+            for row, (_, _, style), score, star, q, mask in zip(
+                    chunk, lexicon.verdicts(scores), scores.score, scores.star, scores.quantified, scores.mask):
+                writer.writerow([row.get("id", count), style, int(score), int(star), int(q),
+                                 "|".join(lexicon.weak_terms(mask))])
+                count += 1
+    elapsed = time.perf_counter() - started
+    print(f"Scored {count} answers in {elapsed:.2f}s ({count / max(elapsed, 1e-9):.0f}/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,14 @@
 import streamlit as st
-import pdfplumber
-import docx
-import pandas as pd
-import plotly.graph_objects as go
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import re
+import os
 import random
-import io
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
+import time
+import uuid
+import metrics
+from jobs import get_manager, PoolBusy
+from session_store import get_session_store
+from engine import (
+    current_taxonomy, analyze_answer, analyze, analysis_pipeline, cheat_sheet_bytes,
+)
 
 # ---------------- 1. PAGE CONFIGURATION ----------------
 st.set_page_config(
@@ -64,170 +63,51 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-# ---------------- 2. INTELLIGENT DATABASES ----------------
+# Prebuilt JD index (python jd_index.py build ...) for role suggestions
+JD_INDEX_PATH = os.environ.get("CAREERCRAFT_JD_INDEX")
 
-SKILL_DB = {
-    "Frontend": ["javascript", "react", "angular", "vue", "html", "css", "tailwind", "redux", "typescript", "figma", "jest", "next.js"],
-    "Backend": ["python", "django", "flask", "node.js", "express", "java", "spring boot", "go", "c#", ".net"],
-    "Database": ["sql", "mysql", "postgresql", "mongodb", "redis", "firebase", "elasticsearch"],
-    "DevOps": ["aws", "docker", "kubernetes", "jenkins", "git", "ci/cd", "linux", "terraform", "azure"],
-    "Data": ["pandas", "numpy", "scikit-learn", "tensorflow", "pytorch", "tableau", "power bi", "excel", "spark"]
-}
+@st.cache_resource
+def load_jd_index(path):
+    from jd_index import JDIndex
+    return JDIndex.load(path)
 
-# MICRO-PROJECT BLUEPRINTS (Platinum Standard)
-PROJECT_BLUEPRINTS = {
-    "react": {"title": "Trello Clone (Kanban)", "task": "Build a Drag-and-Drop Task Board using **React DnD** and **Redux Toolkit**.", "salary": "₹4 LPA"},
-    "next.js": {"title": "SSR Blog Platform", "task": "Build a Server-Side Rendered (SSR) Blog using **getStaticProps** to optimize SEO performance.", "salary": "₹5 LPA"},
-    "jest": {"title": "Login Unit Tests", "task": "Write a Unit Test Suite for a Login Form that validates email formats and mocks the API response.", "salary": "₹3 LPA"},
-    "spring boot": {"title": "Bookstore REST API", "task": "Build a comprehensive API with CRUD operations, connecting to a local **H2 Database** and handling exceptions.", "salary": "₹6 LPA"},
-    "typescript": {"title": "Strictly Typed Calculator", "task": "Convert a JS Calculator to **TypeScript**, enforcing strict types on all event handlers.", "salary": "₹3 LPA"},
-    "figma": {"title": "Dark Mode Dashboard UI", "task": "Design a 'Login & Dashboard' UI kit (Dark Mode) demonstrating **Component Variants** and **Auto-Layout**.", "salary": "₹2 LPA"},
-    "python": {"title": "Crypto Price Tracker", "task": "Build a script using **Requests & Pandas** to fetch live BTC prices and calculate moving averages.", "salary": "₹4 LPA"},
-    "sql": {"title": "E-Commerce Schema (3NF)", "task": "Design a normalized DB for an Amazon clone. Write a query to find 'Top 3 Spenders' using **JOINs**.", "salary": "₹3 LPA"},
-    "aws": {"title": "Serverless API", "task": "Deploy a 'Hello World' function on **AWS Lambda** triggered by API Gateway.", "salary": "₹7 LPA"},
-    "docker": {"title": "Microservice Dockerfile", "task": "Write a multi-stage **Dockerfile** for a Python app to reduce image size by 40%.", "salary": "₹5 LPA"},
-    "git": {"title": "Simulate Merge Conflict", "task": "Create two branches, edit the same line in both, and resolve the conflict using **Git CLI**.", "salary": "₹2 LPA"},
-    "redux": {"title": "Shopping Cart State", "task": "Implement a global Shopping Cart using **Redux**, handling add/remove actions.", "salary": "₹4 LPA"},
-    "html": {"title": "Accessible Landing Page", "task": "Refactor a `div`-heavy page into **Semantic HTML** (<nav>, <article>, <main>) to score 100 on Lighthouse.", "salary": "₹1 LPA"}
-}
+# Expanders run their body even when closed: keep the ranking per analysis
+@st.cache_data(max_entries=256)
+def best_fit_roles(path, key, _resume_text, k=5):
+    return load_jd_index(path).top_k(_resume_text, k)
 
-# DYNAMIC INTERVIEW QUESTIONS
-INTERVIEW_Q = {
-    "react": "Recruiter: I see you built a Trello Clone. How did you optimize rendering to prevent lag when dragging items? Did you use `React.memo`?",
-    "next.js": "Recruiter: Explain the trade-off between **SSR (Server-Side Rendering)** and **ISR (Incremental Static Regeneration)** in your blog.",
-    "jest": "Recruiter: How did you calculate **Code Coverage**? Did you focus on statement coverage or branch coverage?",
-    "spring boot": "Recruiter: How did you handle **Dependency Injection** for your Service and Repository layers? Why use Constructor Injection?",
-    "typescript": "Recruiter: What specific bugs did strict typing catch that you missed in JS? How did you handle `any` types?",
-    "figma": "Recruiter: Walk me through your Dark Mode system. How did you handle color tokens for accessibility?",
-    "python": "Recruiter: In your Crypto Tracker, how would you handle a sudden API rate limit error without crashing the script?",
-    "sql": "Recruiter: Why did you choose 3rd Normal Form? When would you intentionally denormalize this data for read performance?",
-    "aws": "Recruiter: Since you used **AWS Lambda**, how did you manage **Cold Starts**, and why did you choose API Gateway over a Load Balancer?",
-    "docker": "Recruiter: You reduced image size by 40%. Did you use **Alpine Linux** images? What were the security trade-offs of that decision?",
-    "git": "Recruiter: Explain a situation where you chose 'Git Rebase' over 'Git Merge'. How did you handle the history rewrite safety?",
-    "html": "Recruiter: Explain the importance of **Semantic HTML** (like `<article>` vs `<div>`) for accessibility."
+# Module-level so every session points at the same strings
+PRESET_JDS = {
+    "Frontend Developer": "react javascript html css git figma redux typescript jest next.js",
+    "Backend Developer": "python java django spring boot sql api docker aws",
+    "Data Scientist": "python pandas sql machine learning statistics tensorflow"
 }
 
-# RESUME BULLETS
-RESUME_BULLETS = {
-    "react": "Architected a Trello-style Kanban board using React, utilizing Redux for state management of 50+ tasks.",
-    "next.js": "Engineered a Server-Side Rendered (SSR) blog using Next.js, improving SEO indexing and FCP by 40%.",
-    "jest": "Implemented Unit Testing suites using Jest, achieving 100% code coverage for critical authentication modules.",
-    "spring boot": "Developed a scalable RESTful API for a Bookstore using Spring Boot, implementing H2 persistence and custom error handling.",
-    "typescript": "Refactored a legacy codebase to TypeScript, reducing runtime type errors by 90% through strict typing.",
-    "figma": "Designed a scalable Dark Mode UI System in Figma, utilizing Auto-Layout and Variants to speed up dev handoff.",
-    "python": "Developed a financial data pipeline using Python (Pandas), automating real-time crypto analysis.",
-    "aws": "Deployed a serverless architecture on AWS Lambda, optimizing API Gateway triggers for <100ms latency.",
-    "docker": "Optimized container orchestration using multi-stage Dockerfiles, reducing production image size by 40%."
+JOB_STAGES = {
+    "queued": "⏳ Waiting for a free analyzer...",
+    "starting": "⏳ Starting...",
+    "parsing": "📄 Reading your resume...",
+    "matching": "🔎 Matching skills...",
+    "scoring": "📊 Scoring your fit...",
 }
 
-# ---------------- 3. LOGIC ENGINES ----------------
-
-def extract_text(file):
-    text = ""
-    try:
-        if file.name.endswith('.pdf'):
-            with pdfplumber.open(file) as pdf:
-                for page in pdf.pages: text += page.extract_text() or ""
-        elif file.name.endswith('.docx'):
-            doc = docx.Document(file)
-            for p in doc.paragraphs: text += p.text + "\n"
-    except: return ""
-    return text
-
-def extract_skills(text):
-    text = text.lower()
-    found = set()
-    for cat, skills in SKILL_DB.items():
-        for skill in skills:
-            if re.search(r'\b' + re.escape(skill) + r'\b', text):
-                found.add(skill)
-    return found
-
-def calculate_metrics(resume_text, jd_text, r_skills, j_skills):
-    if not j_skills: return 0, 0, 15 
-    k_score = int((len(r_skills.intersection(j_skills)) / len(j_skills)) * 100)
-    tfidf = TfidfVectorizer(stop_words='english')
-    try:
-        matrix = tfidf.fit_transform([resume_text, jd_text])
-        raw_c_score = int(cosine_similarity(matrix[0:1], matrix[1:2])[0][0] * 100)
-    except: raw_c_score = 0
-    c_score = max(raw_c_score, 15)
-    final = int((k_score * 0.6) + (c_score * 0.4))
-    return final, k_score, c_score
-
-def analyze_answer(answer):
-    score = 0
-    feedback = []
-    weak_words = ["maybe", "think", "probably", "sort of", "just"]
-    strong_words = ["architected", "designed", "implemented", "optimized", "reduced", "increased", "led", "built"]
-    
-    if len(answer) < 20:
-        return "⚠️ Weak Answer", "Too short. Use the STAR method (Situation, Task, Action, Result).", "weak"
-    
-    for w in weak_words:
-        if w in answer.lower():
-            score -= 10
-            feedback.append(f"Avoid uncertain words like '{w}'. Be confident.")
-            
-    for w in strong_words:
-        if w in answer.lower():
-            score += 20
-    
-    if score > 10:
-        return "✅ Strong Answer", "Great use of action verbs! Make sure to quantify your results.", "strong"
-    else:
-        return "⚠️ Needs Improvement", f"Your answer is passive. {feedback[0] if feedback else 'Focus on the impact of your actions.'}", "weak"
-
-def generate_cheat_sheet(name, role, skills, bullets):
-    buffer = io.BytesIO()
-    c = canvas.Canvas(buffer, pagesize=letter)
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(50, 750, f"Interview Cheat Sheet: {name}")
-    c.setFont("Helvetica", 12)
-    c.drawString(50, 730, f"Target Role: {role}")
-    c.line(50, 720, 550, 720)
-    
-    y = 690
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(50, y, "1. My Power Hooks")
-    y -= 20
-    c.setFont("Helvetica", 12)
-    c.drawString(50, y, f"• \"I specialize in {', '.join(list(skills)[:2])} to build scalable apps.\"")
-    y -= 20
-    c.drawString(50, y, "• \"I focus on performance optimization and clean architecture.\"")
-    
-    y -= 40
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(50, y, "2. Project Stories (STAR Method)")
-    y -= 25
-    c.setFont("Helvetica", 10)
-    
-    for skill, bullet in list(bullets.items())[:5]:
-        text = bullet.replace("**", "")
-        c.drawString(50, y, f"[{skill.upper()}]")
-        y -= 15
-        c.drawString(60, y, text[:90] + "...") 
-        y -= 20
-        
-    y -= 20
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(50, y, "3. Tech Keywords to Drop")
-    y -= 25
-    c.setFont("Helvetica-Oblique", 12)
-    keywords = ["Scalability", "CI/CD Pipeline", "Latency Reduction", "State Management", "Unit Testing"]
-    c.drawString(50, y, ", ".join(keywords))
-    
-    c.save()
-    buffer.seek(0)
-    return buffer
-
-# ---------------- 4. MAIN APP ----------------
+# ---------------- 2. MAIN APP ----------------
 
 def main():
     if 'analyzed' not in st.session_state:
         st.session_state['analyzed'] = False
         st.session_state['completed_projects'] = set()
         st.session_state['readiness_score'] = 25 
+    if 'session_id' not in st.session_state:
+        st.session_state['session_id'] = uuid.uuid4().hex
+    jobs = get_manager()
+    store = get_session_store()
+    owner = st.session_state['session_id']
+    # Large texts live in the shared store (keyed by content hash), not in
+    # session_state; sessions idle too long lose them and their finished job
+    for expired in store.expire_idle():
+        jobs.forget(expired)
+    taxonomy = current_taxonomy()  # reloaded in place when CAREERCRAFT_TAXONOMY changes
         
     # --- SIDEBAR (UPDATED FOR MOBILE) ---
     with st.sidebar:
@@ -243,9 +123,8 @@ def main():
         uploaded_file = None
 
         if upload_mode == "Upload File":
+            # Parsed in the background job, not here on every rerun
             uploaded_file = st.file_uploader("Upload Resume (PDF/DOCX)", type=["pdf", "docx"])
-            if uploaded_file:
-                resume_text_content = extract_text(uploaded_file)
         else:
             resume_text_content = st.text_area("Paste Resume Text Here", height=200, placeholder="Copy-paste your full resume text here...")
 
@@ -259,34 +138,90 @@ def main():
             role_title = st.text_input("Job Title", "Full Stack Engineer")
             jd_text = st.text_area("Paste JD Here")
         else:
-            role_title = st.selectbox("Select Role", ["Frontend Developer", "Backend Developer", "Data Scientist"])
-            presets = {
-                "Frontend Developer": "react javascript html css git figma redux typescript jest next.js",
-                "Backend Developer": "python java django spring boot sql api docker aws",
-                "Data Scientist": "python pandas sql machine learning statistics tensorflow"
-            }
-            jd_text = presets.get(role_title, "")
+            role_title = st.selectbox("Select Role", list(PRESET_JDS))
+            jd_text = PRESET_JDS.get(role_title, "")
+
+        resume_id = uploaded_file.file_id if uploaded_file else resume_text_content
+        inputs_sig = hash((upload_mode, resume_id, jd_text, role_title))
 
         if st.button("🚀 Analyze My Fit"):
-            if resume_text_content and jd_text:
-                st.session_state['analyzed'] = True
-                st.session_state['resume_text'] = resume_text_content
-                st.session_state['jd_text'] = jd_text
-                st.session_state['role_title'] = role_title
-                st.session_state['readiness_score'] = 25
-                st.session_state['completed_projects'] = set()
+            if (uploaded_file or resume_text_content) and jd_text:
+                resume = (uploaded_file.name, uploaded_file.getvalue()) if uploaded_file else resume_text_content
+                try:
+                    # Supersedes (cancels) this session's previous job, if any
+                    jobs.submit(owner, inputs_sig, analysis_pipeline, resume, jd_text, role_title)
+                    st.session_state.pop('job_error', None)
+                except PoolBusy:
+                    st.warning("⏳ Lots of people are analyzing right now. Please try again in a few seconds.")
             else:
                 st.toast("⚠️ Please provide Resume text and Job Description!", icon="🚨")
 
+        # DEVELOPER PANEL (CAREERCRAFT_METRICS=1)
+        if metrics.ENABLED and st.session_state.get('last_metrics'):
+            last = st.session_state['last_metrics']
+            with st.expander("🛠️ Dev: Last Run Stages"):
+                import pandas as pd
+                st.caption(f"Total {last['seconds'] * 1000:.1f} ms")
+                df_stages = pd.DataFrame(last['stages'])
+                df_stages['ms'] = (df_stages.pop('seconds') * 1000).round(2)
+                st.dataframe(df_stages, use_container_width=True)
+        if metrics.ENABLED:
+            with st.expander("🛠️ Dev: Session Store"):
+                store_stats = store.stats(top=5)
+                st.caption(f"This session: {store.session_bytes(owner) / 1024:.1f} KiB | "
+                           f"process: {store_stats['bytes'] / 2**20:.1f} / {store_stats['max_bytes'] / 2**20:.0f} MiB "
+                           f"across {store_stats['sessions']} sessions")
+                st.json(store_stats, expanded=False)
+
+    # --- BACKGROUND ANALYSIS ---
+    job = jobs.get(owner)
+    if job is not None and not job.done:
+        if job.signature != inputs_sig:
+            jobs.cancel(owner)
+            st.toast("Inputs changed — the running analysis was cancelled.", icon="✋")
+        else:
+            st.progress(job.fraction, text=JOB_STAGES.get(job.stage, "⏳ Working..."))
+            if st.button("✖ Cancel Analysis"):
+                jobs.cancel(owner)
+            time.sleep(0.3)
+            st.rerun()
+    elif job is not None and st.session_state.get('applied_job') != job.id:
+        st.session_state['applied_job'] = job.id
+        if job.status == "done":
+            out = job.result
+            st.session_state['analyzed'] = True
+            store.put(owner, 'resume_text', out['resume_text'])
+            store.put(owner, 'jd_text', out['jd_text'])
+            st.session_state['role_title'] = out['role_title']
+            st.session_state['analysis_key'] = out['analysis_key']
+            st.session_state['readiness_score'] = 25
+            st.session_state['completed_projects'] = set()
+            if out['metrics']:
+                st.session_state['last_metrics'] = out['metrics']
+            if out['extraction'] is not None and out['extraction'].truncated:
+                st.toast(f"Only the first {out['extraction'].pages} pages of your resume were read.", icon="ℹ️")
+        elif job.status == "failed":
+            st.session_state['job_error'] = job.error
+        # The result is applied; don't keep its texts alive in the job table
+        jobs.forget(owner)
+    if st.session_state.get('job_error'):
+        st.error(f"⚠️ {st.session_state['job_error']}")
+
     # --- MAIN DASHBOARD ---
     if st.session_state['analyzed']:
-        r_text = st.session_state['resume_text']
-        j_text = st.session_state['jd_text']
-        r_skills = extract_skills(r_text)
-        j_skills = extract_skills(j_text.lower())
-        matched = r_skills.intersection(j_skills)
-        missing = j_skills.difference(r_skills)
-        final, k_score, c_score = calculate_metrics(r_text, j_text, r_skills, j_skills)
+        analysis_resume = store.get(owner, 'resume_text')
+        analysis_jd = store.get(owner, 'jd_text')
+        if analysis_resume is None or analysis_jd is None:
+            # Expired while idle, or evicted under memory pressure
+            st.session_state['analyzed'] = False
+            st.warning("⌛ Your analysis expired. Click Analyze My Fit to run it again.")
+
+    if st.session_state['analyzed']:
+        # Cached across reruns and sessions: button clicks only re-render
+        result = analyze(analysis_resume, analysis_jd,
+                         st.session_state['role_title'], key=st.session_state['analysis_key'])
+        matched, missing = result.matched, result.missing
+        final, k_score, c_score = result.final, result.k_score, result.c_score
 
         # HERO
         st.title(f"🔍 Analysis: {st.session_state['role_title']}")
@@ -297,8 +232,9 @@ def main():
             st.progress(st.session_state['readiness_score'] / 100)
             st.markdown(f"**Level: {st.session_state['readiness_score']}%** (Build projects to level up!)")
         with col_export:
-            pdf_bytes = generate_cheat_sheet("Candidate", st.session_state['role_title'], matched, RESUME_BULLETS)
-            st.download_button("📄 Interview Cheat Sheet", data=pdf_bytes, file_name="Interview_Cheat_Sheet.pdf", mime="application/pdf")
+            role_title = st.session_state['role_title']
+            # Callable data: the PDF is only rendered when the button is clicked
+            st.download_button("📄 Interview Cheat Sheet", data=lambda: cheat_sheet_bytes(result, role_title), file_name="Interview_Cheat_Sheet.pdf", mime="application/pdf")
 
         # METRICS
         st.markdown("---")
@@ -319,6 +255,12 @@ def main():
                 st.info(f"**Instead of:** 'Used {list(matched)[0] if matched else 'Java'}'")
                 st.success(f"**Write this:** 'Leveraged **{list(matched)[0] if matched else 'Java'}** to architect scalable solutions, improving system latency by 30%.'")
 
+        # BEST-FIT ROLES (only when a JD index is deployed)
+        if JD_INDEX_PATH:
+            with st.expander("🧭 Best-Fit Roles From the Job Board"):
+                for r in best_fit_roles(JD_INDEX_PATH, st.session_state['analysis_key'], analysis_resume):
+                    st.markdown(f"**{r['jd_id']}** — {r['final']}% match (keyword {r['k_score']}%, context {r['c_score']}%)")
+
         st.markdown("---")
 
         # BLUEPRINTS
@@ -337,7 +279,7 @@ def main():
             
             if missing:
                 for skill in list(missing)[:3]:
-                    bp = PROJECT_BLUEPRINTS.get(skill, {"title": f"{skill.title()} Project", "task": f"Build a practical application demonstrating {skill}.", "salary": "₹2 LPA"})
+                    bp = taxonomy.project_blueprints.get(skill, {"title": f"{skill.title()} Project", "task": f"Build a practical application demonstrating {skill}.", "salary": "₹2 LPA"})
                     
                     with st.container():
                         st.markdown(f"""
@@ -357,7 +299,7 @@ def main():
                             st.rerun()
 
                         if skill in st.session_state['completed_projects']:
-                            bullet = RESUME_BULLETS.get(skill, f"• Implemented **{skill.title()}** to optimize workflows.")
+                            bullet = taxonomy.resume_bullets.get(skill, f"• Implemented **{skill.title()}** to optimize workflows.")
                             st.markdown(f"**Resume Bullet:**")
                             st.code(bullet, language="markdown")
                             st.toast(f"Level Up! {skill.title()} Interview Question Unlocked!", icon="🔓")
@@ -378,13 +320,13 @@ def main():
             if st.session_state['completed_projects']:
                 st.markdown("**🔓 UNLOCKED QUESTIONS (New Skills):**")
                 for s in st.session_state['completed_projects']:
-                    q = INTERVIEW_Q.get(s, f"How did you implement {s}?")
+                    q = taxonomy.interview_questions.get(s, f"How did you implement {s}?")
                     st.success(f"**{s.title()} (Unlocked):** {q}")
                     active_question = q 
             elif matched:
                 st.markdown("**Based on your current resume:**")
                 for s in list(matched)[:1]:
-                     q = INTERVIEW_Q.get(s, f"Tell me about your experience with {s}.")
+                     q = taxonomy.interview_questions.get(s, f"Tell me about your experience with {s}.")
                      st.info(f"**{s.title()}:** {q}")
                      active_question = q
 
@@ -417,6 +359,7 @@ def main():
                 comp_data.append({"Skill": s.title(), "Status": "❌ Missing", "Recommendation": f"Critical gap. Build a {s.title()} project."})
             
             if comp_data:
+                import pandas as pd
                 df_comp = pd.DataFrame(comp_data)
                 st.dataframe(df_comp, use_container_width=True)
             else:
@@ -441,8 +384,8 @@ Motivated {st.session_state['role_title']} with a strong foundation in {', '.joi
 """
             if st.session_state['completed_projects']:
                 for s in st.session_state['completed_projects']:
-                    bullet = RESUME_BULLETS.get(s, f"Implemented {s} project.")
-                    resume_draft += f"**{PROJECT_BLUEPRINTS[s]['title']}** | *{s.title()}*\n"
+                    bullet = taxonomy.resume_bullets.get(s, f"Implemented {s} project.")
+                    resume_draft += f"**{taxonomy.project_blueprints[s]['title']}** | *{s.title()}*\n"
                     resume_draft += f"- {bullet}\n\n"
             
             for s in list(matched)[:2]:
@@ -464,4 +407,8 @@ Motivated {st.session_state['role_title']} with a strong foundation in {', '.joi
         st.info("👈 Open Sidebar to Paste Resume or Upload File.")
 
 if __name__ == "__main__":
-    main()
+    metrics.start_http_server()
+    with metrics.run("rerun") as run:
+        main()
+    if run is not None and run.stages:
+        st.session_state['last_metrics'] = run.as_dict()
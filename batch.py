@@ -0,0 +1,301 @@
+import argparse
+import csv
+import heapq
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from engine import (
+    extract_document, extract_skills, calculate_metrics, blend_score, configure_text_cache, skill_space,
+    configure_taxonomy, configure_extraction,
+)
+from extractors import ExtractionResult
+
+# ---------------- HEADLESS BATCH SCORING ----------------
+# Scores every resume against every job description without the Streamlit UI:
+#   python batch.py --resumes resumes/ --jds jds.jsonl --out scores.csv
+# Inputs are a directory of .pdf/.docx/.txt files or a JSONL file with one
+# {"id": ..., "text": ...} object per line.
+
+DOC_EXTENSIONS = ('.pdf', '.docx', '.txt')
+FIELDS = ["resume_id", "jd_id", "final", "keyword", "context", "matched", "missing"]
+REPORT_FIELDS = ["doc_id", "path", "pages", "seconds", "error", "truncated", "cached"]
+GAP_FIELDS = ["skill", "category", "resumes_with", "jds_requiring", "missing_pairs"]
+
+
+def load_documents(source):
+    """Return [(doc_id, path_or_None, text_or_None), ...] for a directory or JSONL file."""
+    docs = []
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            if name.lower().endswith(DOC_EXTENSIONS):
+                docs.append((os.path.splitext(name)[0], os.path.join(source, name), None))
+    else:
+        with open(source, encoding="utf-8") as fh:
+            for i, line in enumerate(fh):
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                docs.append((str(row.get("id", i)), None, row.get("text", "")))
+    return docs
+
+
+def _read(path):
+    if path.lower().endswith('.txt'):
+        started = time.perf_counter()
+        with open(path, encoding="utf-8", errors="ignore") as fh:
+            text = fh.read()
+        return ExtractionResult(text, None, time.perf_counter() - started, None, False)
+    with open(path, 'rb') as fh:
+        return extract_document(fh)
+
+
+def _prepare(doc):
+    """(doc_id, text, skills), plus a per-file extraction report."""
+    doc_id, path, text = doc
+    report = {"doc_id": doc_id, "path": path, "pages": None, "seconds": 0.0,
+              "error": None, "truncated": False, "cached": False}
+    if text is None:
+        result = _read(path)
+        text = result.text
+        report.update(pages=result.pages, seconds=result.seconds, error=result.error,
+                      truncated=result.truncated, cached=result.cached)
+    return (doc_id, text, extract_skills(text)), report
+
+
+# JDs (and the context model, if any) are set up once per worker through
+# the pool initializer
+_JDS = []
+_MODEL = None
+_JD_MATRIX = None
+_JD_BITS = None
+_JD_EMPTY = None
+_TOP_K = None
+
+
+def _init_worker(jds, model_path=None, top_k=None, taxonomy=None):
+    global _JDS, _MODEL, _JD_MATRIX, _JD_BITS, _JD_EMPTY, _TOP_K
+    if taxonomy:
+        configure_taxonomy(taxonomy)
+    _JDS = jds
+    _TOP_K = top_k
+    if model_path:
+        from context_model import ContextModel
+        _MODEL = ContextModel.load(model_path)
+        _JD_MATRIX = _MODEL.transform(text for _, text, _ in jds)
+        _JD_BITS = skill_space().encode_many(skills for _, _, skills in jds)
+        _JD_EMPTY = [j for j, (_, _, skills) in enumerate(jds) if not skills]
+
+
+def _row(resume_id, jd_id, final, k_score, c_score, r_skills, j_skills):
+    return {
+        "resume_id": resume_id,
+        "jd_id": jd_id,
+        "final": final,
+        "keyword": k_score,
+        "context": c_score,
+        "matched": ";".join(sorted(r_skills & j_skills)),
+        "missing": ";".join(sorted(j_skills - r_skills)),
+    }
+
+
+def _score_chunk(chunk):
+    if _MODEL is None:
+        rows = []
+        for resume_id, r_text, r_skills in chunk:
+            per_resume = [_row(resume_id, jd_id, *calculate_metrics(r_text, j_text, r_skills, j_skills),
+                               r_skills, j_skills)
+                          for jd_id, j_text, j_skills in _JDS]
+            if _TOP_K:
+                per_resume = heapq.nlargest(_TOP_K, per_resume, key=lambda row: row["final"])
+            rows.extend(per_resume)
+        return rows
+
+    import numpy as np
+    from skill_vectors import k_scores
+    c_matrix = _MODEL.c_scores([text for _, text, _ in chunk], _JD_MATRIX)
+    k_matrix = k_scores(skill_space().encode_many(skills for _, _, skills in chunk), _JD_BITS)
+    # Same integers as blend_score; a JD without skills scores (0, 0, 15)
+    # like calculate_metrics
+    c_matrix[:, _JD_EMPTY] = 15
+    final = (k_matrix * 0.6 + c_matrix * 0.4).astype(np.int64)
+    final[:, _JD_EMPTY] = 0
+    n = len(_JDS)
+    if _TOP_K:
+        # Only the k winners per resume become rows. Ties go to the earlier
+        # JD and rows come best first, as with heapq.nlargest
+        k = min(_TOP_K, n)
+        key = final * n + (n - 1 - np.arange(n))
+        best = np.argpartition(-key, k - 1, axis=1)[:, :k] if k < n else np.tile(np.arange(n), (len(chunk), 1))
+        best = np.take_along_axis(best, np.argsort(-np.take_along_axis(key, best, axis=1), axis=1), axis=1)
+    else:
+        best = np.tile(np.arange(n), (len(chunk), 1))
+    rows = []
+    for i, (resume_id, _, r_skills) in enumerate(chunk):
+        for j in best[i].tolist():
+            jd_id, _, j_skills = _JDS[j]
+            rows.append(_row(resume_id, jd_id, int(final[i, j]), int(k_matrix[i, j]), int(c_matrix[i, j]),
+                             r_skills, j_skills))
+    return rows
+
+
+def _chunks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _init_extractor(text_cache_dir, taxonomy=None, enough_chars=None, pdf_workers=None):
+    # Every batch worker is already a process of its own: one parser each
+    # unless asked otherwise, not the app's pool sized for its job threads
+    if pdf_workers is None:
+        pdf_workers = int(os.environ.get("CAREERCRAFT_PDF_WORKERS", "1"))
+    configure_extraction(enough_chars, pdf_workers)
+    if text_cache_dir:
+        configure_text_cache(directory=text_cache_dir)
+    if taxonomy:
+        configure_taxonomy(taxonomy)
+
+
+def score_matrix(resumes, jds, workers=None, context_model=None, top_k=None, text_cache_dir=None,
+                 taxonomy=None, enough_chars=None, pdf_workers=None, gaps=False):
+    """Score resumes x jds, both lists of (doc_id, path_or_None, text_or_None).
+
+    Without context_model every pair uses calculate_metrics' pairwise TF-IDF
+    (today's numbers). With a path, a corpus ContextModel is loaded from it,
+    or fitted on the JDs and saved there first, and context scores come from
+    one sparse product per chunk. top_k keeps the best JDs per resume.
+    text_cache_dir shares parsed PDF/DOCX text between runs and workers.
+    taxonomy is a taxonomy source file to match skills against (default:
+    CAREERCRAFT_TAXONOMY or the built-in one). enough_chars / pdf_workers
+    override CAREERCRAFT_ENOUGH_CHARS / CAREERCRAFT_PDF_WORKERS. gaps adds
+    stats["gaps"] (see cohort_gaps). Documents that fail to extract are left
+    out of the matrix and listed in stats["failed"].
+    Returns (rows, stats).
+    """
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    if workers == 1:
+        _init_extractor(text_cache_dir, taxonomy, enough_chars, pdf_workers)
+        prepared = [_prepare(d) for d in resumes + jds]
+    else:
+        chunk = max(1, (len(resumes) + len(jds)) // (workers * 4))
+        with ProcessPoolExecutor(workers, initializer=_init_extractor,
+                                 initargs=(text_cache_dir, taxonomy, enough_chars, pdf_workers)) as pool:
+            prepared = list(pool.map(_prepare, resumes + jds, chunksize=chunk))
+    reports = [report for _, report in prepared]
+    # A file that could not be read is reported in stats["failed"], not
+    # scored as an empty document
+    prepared_r = [doc for doc, report in prepared[:len(resumes)] if not report["error"]]
+    prepared_j = [doc for doc, report in prepared[len(resumes):] if not report["error"]]
+    if context_model and not os.path.exists(context_model) and prepared_j:
+        from context_model import ContextModel
+        ContextModel.fit(text for _, text, _ in prepared_j).save(context_model)
+    extracted = time.perf_counter()
+
+    if taxonomy:
+        configure_taxonomy(taxonomy)  # the gap report runs here, in the parent
+    init_args = (prepared_j, context_model, top_k, taxonomy)
+    chunks = _chunks(prepared_r, max(1, min(256, len(prepared_r) // (workers * 4)))) if prepared_j else []
+    if workers == 1:
+        _init_worker(*init_args)
+        rows = [row for part in map(_score_chunk, chunks) for row in part]
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=init_args) as pool:
+            rows = [row for part in pool.map(_score_chunk, chunks) for row in part]
+    finished = time.perf_counter()
+
+    stats = {
+        "resumes": len(prepared_r),
+        "jds": len(prepared_j),
+        "pairs": len(prepared_r) * len(prepared_j),
+        "rows": len(rows),
+        "workers": workers,
+        "failed": [r for r in reports if r["error"]],
+        "reports": reports,
+        "extract_seconds": extracted - started,
+        "score_seconds": finished - extracted,
+        "total_seconds": finished - started,
+    }
+    stats["docs_per_second"] = (len(resumes) + len(jds)) / max(stats["extract_seconds"], 1e-9)
+    stats["pairs_per_second"] = stats["pairs"] / max(stats["score_seconds"], 1e-9)
+    if gaps:
+        stats["gaps"] = cohort_gaps(prepared_r, prepared_j)
+    return rows, stats
+
+
+def cohort_gaps(resumes, jds):
+    """Per taxonomy skill, how often the cohort lacks what the JDs ask for; most missed first."""
+    space = skill_space()
+    r_bits = space.encode_many(skills for _, _, skills in resumes)
+    j_bits = space.encode_many(skills for _, _, skills in jds)
+    have, wanted = space.unpack(r_bits).sum(axis=0), space.unpack(j_bits).sum(axis=0)
+    missing = space.missing_counts(r_bits, j_bits)
+    gaps = [
+        {"skill": skill, "category": space.category_of[i], "resumes_with": int(have[i]),
+         "jds_requiring": int(wanted[i]), "missing_pairs": int(missing[i])}
+        for i, skill in enumerate(space.skills)
+    ]
+    return sorted(gaps, key=lambda row: -row["missing_pairs"])
+
+
+def write_report(reports, out, fields=REPORT_FIELDS):
+    with open(out, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.DictWriter(fh, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(reports)
+
+
+def write_rows(rows, out, fmt=None):
+    fmt = fmt or ("parquet" if out.endswith(".parquet") else "csv")
+    if fmt == "parquet":
+        import pandas as pd
+        pd.DataFrame(rows, columns=FIELDS).to_parquet(out, index=False)
+    else:
+        with open(out, "w", newline="", encoding="utf-8") as fh:
+            writer = csv.DictWriter(fh, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score N resumes x M job descriptions.")
+    parser.add_argument("--resumes", required=True, help="Directory of resumes or JSONL file")
+    parser.add_argument("--jds", required=True, help="Directory of job descriptions or JSONL file")
+    parser.add_argument("--out", required=True, help="Output path (.csv or .parquet)")
+    parser.add_argument("--format", choices=["csv", "parquet"], help="Override output format")
+    parser.add_argument("--workers", type=int, default=None, help="Process count (default: all cores)")
+    parser.add_argument("--context-model", help="Fitted TF-IDF model path (fitted on the JDs if missing); "
+                                                "omit for the legacy pairwise context score")
+    parser.add_argument("--top-k", type=int, default=None, help="Keep only the best K JDs per resume")
+    parser.add_argument("--text-cache-dir", help="Directory for the shared parsed-text cache")
+    parser.add_argument("--enough-chars", type=int, default=None,
+                        help="Stop reading a PDF once this many characters are in (0: read it all)")
+    parser.add_argument("--pdf-workers", type=int, default=None,
+                        help="Killable PDF parser processes per worker (default 1; 0: parse in-process)")
+    parser.add_argument("--extract-report", help="CSV with per-file extraction time, pages and errors")
+    parser.add_argument("--taxonomy", help="Taxonomy source (.json/.yaml/.csv); default: built-in")
+    parser.add_argument("--gap-report", help="CSV of skills the resumes lack, by how many resume x JD pairs")
+    args = parser.parse_args(argv)
+
+    rows, stats = score_matrix(load_documents(args.resumes), load_documents(args.jds),
+                               args.workers, args.context_model, args.top_k, args.text_cache_dir, args.taxonomy,
+                               args.enough_chars, args.pdf_workers, gaps=bool(args.gap_report))
+    write_rows(rows, args.out, args.format)
+    if args.extract_report:
+        write_report(stats["reports"], args.extract_report)
+    if args.gap_report:
+        write_report(stats["gaps"], args.gap_report, GAP_FIELDS)
+    print(
+        f"Scored {stats['pairs']} pairs ({stats['resumes']} resumes x {stats['jds']} JDs) "
+        f"on {stats['workers']} workers in {stats['total_seconds']:.2f}s | "
+        f"extract {stats['docs_per_second']:.1f} docs/s, score {stats['pairs_per_second']:.1f} pairs/s",
+        file=sys.stderr,
+    )
+    for report in stats["failed"]:
+        print(f"  failed: {report['doc_id']} ({report['path']}): {report['error']}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
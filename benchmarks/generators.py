@@ -0,0 +1,104 @@
+import io
+import random
+
+from engine import SKILL_DB
+
+# ---------------- SYNTHETIC INPUTS ----------------
+# Deterministic (seeded) resumes, JDs, answers and file fixtures so numbers
+# are comparable between commits.
+
+FILLER = (
+    "led team built delivered scalable service customers platform improved reduced latency "
+    "designed pipeline reliable feature release stakeholders mentored reviewed migrated "
+    "dashboards automated testing monitoring production incident quarterly roadmap"
+).split()
+
+REAL_SKILLS = [skill for skills in SKILL_DB.values() for skill in skills]
+
+
+def taxonomy(size, seed=0):
+    """REAL_SKILLS padded with made-up multi-word skills up to size entries."""
+    rng = random.Random(seed)
+    skills = list(REAL_SKILLS[:size])
+    syllables = ["ka", "zu", "mo", "rex", "li", "tron", "vi", "qua", "dex", "po", "lum", "sy"]
+    while len(skills) < size:
+        word = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+        if rng.random() < 0.3:
+            word += " " + rng.choice(["db", "js", "ops", "ml", "cloud", "studio"])
+        skills.append(word)
+    return sorted(set(skills))
+
+
+def text(words, skill_density=0.05, skills=REAL_SKILLS, seed=0):
+    """~words words, each a skill with probability skill_density."""
+    rng = random.Random(seed)
+    out = []
+    for i in range(words):
+        out.append(rng.choice(skills) if rng.random() < skill_density else rng.choice(FILLER))
+        if i % 14 == 13:
+            out[-1] += "."
+    return " ".join(out)
+
+
+def resume(words=600, skill_density=0.05, skills=REAL_SKILLS, seed=0):
+    return text(words, skill_density, skills, seed)
+
+
+def job_description(words=150, skill_density=0.12, skills=REAL_SKILLS, seed=1):
+    return text(words, skill_density, skills, seed)
+
+
+# Typed answers carry Unicode punctuation; these once read as weak because
+# "—" and curly quotes glued the action verbs to their neighbours
+PUNCTUATED_ANSWERS = [
+    "I built—and optimized—the entire pipeline…",
+    "I “architected” and “implemented” the data platform…",
+    "Latency dropped 30\u00a0% after I chose to rebuild the cache—as a result, users stayed.",
+]
+_MARKS = [" ", " ", " ", "—", "… ", " “", "” ", "\u00a0"]
+
+
+def answer(words=60, seed=0, punctuated=False):
+    rng = random.Random(seed)
+    pool = FILLER + ["maybe", "just", "think", "probably", "architected", "optimized", "30%", "because"]
+    picked = [rng.choice(pool) for _ in range(words)]
+    if not punctuated:
+        return " ".join(picked)
+    return "".join(word + rng.choice(_MARKS) for word in picked)
+
+
+def pdf_bytes(body, pages=2):
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+    words = body.split()
+    per_page = max(1, len(words) // pages)
+    for p in range(pages):
+        y = 750
+        line = []
+        for word in words[p * per_page:(p + 1) * per_page]:
+            line.append(word)
+            if len(line) == 12:
+                c.drawString(50, y, " ".join(line))
+                line, y = [], y - 14
+                if y < 50:
+                    break
+        if line:
+            c.drawString(50, y, " ".join(line))
+        c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+
+def docx_bytes(body, paragraph_words=40):
+    import docx
+
+    doc = docx.Document()
+    words = body.split()
+    for i in range(0, len(words), paragraph_words):
+        doc.add_paragraph(" ".join(words[i:i + paragraph_words]))
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
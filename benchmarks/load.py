@@ -0,0 +1,135 @@
+import argparse
+import asyncio
+import itertools
+import json
+import statistics
+import sys
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+from benchmarks import generators as gen
+
+# ---------------- SERVICE LOAD GENERATOR ----------------
+#   python service.py --workers 4 &
+#   python -m benchmarks.load --requests 5000 --concurrency 64
+#   python -m benchmarks.load --batch 50 --unique 0
+# Closed loop over keep-alive connections: each connection sends its next
+# request as soon as the previous response arrives. --unique cycles that many
+# distinct resume/JD pairs (small values exercise coalescing and the result
+# cache); --unique 0 makes every item distinct.
+
+
+def build_bodies(count, unique, batch, words, seed=0):
+    """Pre-serialised request bodies; requests cycle through them."""
+    per_body = max(batch, 1)
+    items = count * per_body if unique == 0 else unique
+    base = [gen.resume(words, seed=seed + i) for i in range(min(items, 500))]
+    jds = [gen.job_description(seed=seed + i) for i in range(min(items, 50))]
+
+    def item(i):
+        i %= items
+        # Past the base pool, a suffix keeps items distinct at the same cost
+        resume = base[i % len(base)] + (f" ref{i}" if i >= len(base) else "")
+        return {"resume_text": resume, "jd_text": jds[i % len(jds)]}
+
+    n_bodies = count if unique == 0 else max(1, min(count, -(-unique // per_body)))
+    bodies = []
+    for b in range(n_bodies):
+        chunk = [item(b * per_body + j) for j in range(per_body)]
+        bodies.append(json.dumps({"items": chunk} if batch else chunk[0]).encode())
+    return bodies
+
+
+async def _connection(host, port, path, bodies, counter, total, latencies, statuses):
+    reader = writer = None
+    while True:
+        i = next(counter)
+        if i >= total:
+            break
+        body = bodies[i % len(bodies)]
+        if writer is None:
+            reader, writer = await asyncio.open_connection(host, port)
+        request = (f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                   f"Content-Length: {len(body)}\r\n\r\n").encode() + body
+        started = time.perf_counter()
+        try:
+            writer.write(request)
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            length, close = 0, False
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                name = name.strip().lower()
+                if name == "content-length":
+                    length = int(value)
+                elif name == "connection":
+                    close = value.strip().lower() == "close"
+            await reader.readexactly(length)
+        except (ConnectionError, asyncio.IncompleteReadError, IndexError, ValueError):
+            status, close = "conn_error", True
+        latencies.append(time.perf_counter() - started)
+        statuses[status] += 1
+        if close:
+            writer.close()
+            reader = writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def run_load(url, bodies, total, concurrency, batch):
+    parts = urlsplit(url)
+    path = "/v1/score/batch" if batch else "/v1/score"
+    latencies, statuses, counter = [], Counter(), itertools.count()
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _connection(parts.hostname, parts.port or 80, path, bodies, counter, total, latencies, statuses)
+        for _ in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - started
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": len(latencies),
+        "items": len(latencies) * max(batch, 1),
+        "concurrency": concurrency,
+        "seconds": elapsed,
+        "requests_per_s": len(latencies) / elapsed,
+        "items_per_s": len(latencies) * max(batch, 1) / elapsed,
+        "p50_ms": cuts[49] * 1000,
+        "p95_ms": cuts[94] * 1000,
+        "p99_ms": cuts[98] * 1000,
+        "max_ms": max(latencies) * 1000,
+        "statuses": {str(k): v for k, v in statuses.items()},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drive the scoring service and report latency / throughput.")
+    parser.add_argument("--url", default="http://127.0.0.1:8700")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--batch", type=int, default=0, help="Items per request to /v1/score/batch (0: single)")
+    parser.add_argument("--unique", type=int, default=200, help="Distinct resume/JD pairs (0: all distinct)")
+    parser.add_argument("--words", type=int, default=400, help="Words per synthetic resume")
+    parser.add_argument("--save", help="Write the results JSON here")
+    args = parser.parse_args(argv)
+
+    bodies = build_bodies(args.requests, args.unique, args.batch, args.words)
+    result = asyncio.run(run_load(args.url, bodies, args.requests, args.concurrency, args.batch))
+    print(f"{result['requests']} requests ({result['items']} items), concurrency {result['concurrency']}, "
+          f"{result['seconds']:.2f}s")
+    print(f"  throughput  {result['requests_per_s']:.1f} req/s, {result['items_per_s']:.1f} items/s")
+    print(f"  latency     p50 {result['p50_ms']:.1f} ms  p95 {result['p95_ms']:.1f} ms  "
+          f"p99 {result['p99_ms']:.1f} ms  max {result['max_ms']:.1f} ms")
+    print(f"  statuses    {result['statuses']}")
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as fh:
+            json.dump(result, fh, indent=2)
+    return 0 if set(result["statuses"]) == {"200"} else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
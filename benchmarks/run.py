@@ -0,0 +1,241 @@
+import argparse
+import functools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import engine
+from extractors import extract_bytes
+from matcher import SkillMatcher
+from taxonomy import compile_taxonomy, load_taxonomy
+from benchmarks import generators as gen
+
+# ---------------- HOT-PATH BENCHMARKS ----------------
+#   python -m benchmarks.run --save baseline.json
+#   python -m benchmarks.run --compare baseline.json
+# Each case reports latency percentiles, throughput and peak traced memory;
+# --compare flags cases whose p50 slowed by more than --threshold.
+
+
+def _percentile(sorted_values, q):
+    index = min(len(sorted_values) - 1, max(0, round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(fn, repeat, warmup=1):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    # Peak memory in a separate pass: tracemalloc distorts timings
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    samples.sort()
+    return {
+        "repeat": repeat,
+        "p50_ms": _percentile(samples, 50) * 1000,
+        "p95_ms": _percentile(samples, 95) * 1000,
+        "p99_ms": _percentile(samples, 99) * 1000,
+        "mean_ms": statistics.fmean(samples) * 1000,
+        "ops_per_s": repeat / sum(samples) if sum(samples) else float("inf"),
+        "peak_kib": peak / 1024,
+    }
+
+
+def _analyze_answer_substring(answer):
+    # The previous Hot Seat scorer, kept as the baseline for answers.py
+    score = 0
+    feedback = []
+    weak_words = ["maybe", "think", "probably", "sort of", "just"]
+    strong_words = ["architected", "designed", "implemented", "optimized", "reduced", "increased", "led", "built"]
+    if len(answer) < 20:
+        return "⚠️ Weak Answer", "Too short. Use the STAR method (Situation, Task, Action, Result).", "weak"
+    for w in weak_words:
+        if w in answer.lower():
+            score -= 10
+            feedback.append(f"Avoid uncertain words like '{w}'. Be confident.")
+    for w in strong_words:
+        if w in answer.lower():
+            score += 20
+    if score > 10:
+        return "✅ Strong Answer", "Great use of action verbs! Make sure to quantify your results.", "strong"
+    return "⚠️ Needs Improvement", f"Your answer is passive. {feedback[0] if feedback else 'Focus on the impact of your actions.'}", "weak"
+
+
+def cases(sizes, taxonomy_sizes, density, workdir):
+    """Yield (name, setup) for every stage and input size.
+
+    setup() builds the case's fixture and returns the callable to time, so
+    cases excluded by --filter cost nothing. Files go under workdir.
+    """
+    @functools.lru_cache(maxsize=None)
+    def jd():
+        text = gen.job_description()
+        return text, engine.extract_skills(text.lower())
+
+    @functools.lru_cache(maxsize=None)
+    def body(words):
+        return gen.resume(words, density)
+
+    @functools.lru_cache(maxsize=None)
+    def taxonomy(size):
+        skills = gen.taxonomy(size)
+        return skills, gen.resume(2000, density, skills)
+
+    def compiled_taxonomy(size):
+        source = os.path.join(workdir, f"taxonomy-{size}.json")
+        with open(source, "w", encoding="utf-8") as fh:
+            json.dump({"categories": {"Generated": taxonomy(size)[0]}}, fh)
+        compile_taxonomy(source)
+
+        return functools.partial(load_taxonomy, source)
+
+    def metrics_case(words):
+        text, jd_skills = jd()
+        b = body(words)
+        r_skills = engine.extract_skills(b)
+        return lambda: engine.calculate_metrics(b, text, r_skills, jd_skills)
+
+    for words in sizes:
+        yield f"extract_text.pdf[words={words}]", lambda w=words: functools.partial(
+            extract_bytes, gen.pdf_bytes(body(w), pages=max(1, w // 400)), ".pdf")
+        yield f"extract_text.docx[words={words}]", lambda w=words: functools.partial(
+            extract_bytes, gen.docx_bytes(body(w)), ".docx")
+        yield f"extract_skills[words={words}]", lambda w=words: functools.partial(engine.extract_skills, body(w))
+        yield f"calculate_metrics[words={words}]", lambda w=words: metrics_case(w)
+    for size in taxonomy_sizes:
+        yield f"skill_matcher.build[taxonomy={size}]", lambda n=size: functools.partial(
+            SkillMatcher, taxonomy(n)[0])
+        yield f"skill_matcher.find[taxonomy={size}]", lambda n=size: functools.partial(
+            SkillMatcher(taxonomy(n)[0]).find, taxonomy(n)[1])
+        yield f"taxonomy.load[taxonomy={size}]", lambda n=size: compiled_taxonomy(n)
+
+    @functools.lru_cache(maxsize=None)
+    def archive(punctuated=False):
+        return [gen.answer(60, seed=i, punctuated=punctuated) for i in range(10000)]
+
+    def score_archive(punctuated=False):
+        from answers import score_answers
+        return functools.partial(score_answers, archive(punctuated))
+
+    for words in (20, 60, 200):
+        yield f"analyze_answer.substring[words={words}]", lambda w=words: functools.partial(
+            _analyze_answer_substring, gen.answer(w))
+        yield f"analyze_answer[words={words}]", lambda w=words: functools.partial(
+            engine.analyze_answer, gen.answer(w))
+    yield "analyze_answer[punctuated]", lambda: lambda: [engine.analyze_answer(a) for a in gen.PUNCTUATED_ANSWERS]
+    yield "analyze_answer.substring[10000x60]", lambda: lambda: [_analyze_answer_substring(a) for a in archive()]
+    yield "score_answers[10000x60]", score_archive
+    yield "analyze_answer.substring[10000x60,punctuated]", lambda: lambda: [
+        _analyze_answer_substring(a) for a in archive(True)]
+    yield "score_answers[10000x60,punctuated]", lambda: score_archive(True)
+
+    @functools.lru_cache(maxsize=None)
+    def cohort():
+        from skill_vectors import k_scores
+        space = engine.skill_space()
+        resumes = [engine.extract_skills(gen.resume(300, density, seed=i)) for i in range(200)] * 10
+        roles = [engine.extract_skills(gen.job_description(seed=i).lower()) for i in range(50)]
+        return space, resumes, roles, space.encode_many(resumes), space.encode_many(roles), k_scores
+
+    def keyword_sets():
+        _, resumes, roles, _, _, _ = cohort()
+        return lambda: [[engine.keyword_score(r, j) for j in roles if j] for r in resumes]
+
+    def keyword_bits():
+        _, _, _, r_bits, j_bits, k_scores = cohort()
+        return lambda: k_scores(r_bits, j_bits)
+
+    def coverage():
+        space, _, _, r_bits, _, _ = cohort()
+        return lambda: space.category_coverage(r_bits)
+
+    def cheat_sheet():
+        matched = set(list(jd()[1])[:5])
+        return lambda: engine.generate_cheat_sheet("Candidate", "Engineer", matched, engine.RESUME_BULLETS)
+
+    yield "keyword_score.sets[2000x50]", keyword_sets
+    yield "keyword_score.bitset[2000x50]", keyword_bits
+    yield "category_coverage[2000]", coverage
+    yield "generate_cheat_sheet", cheat_sheet
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    print(f"\n{'case':<42}{'base p50':>10}{'now p50':>10}{'change':>9}")
+    for name, now in results["cases"].items():
+        base = baseline["cases"].get(name)
+        if not base:
+            continue
+        change = (now["p50_ms"] - base["p50_ms"]) / base["p50_ms"] if base["p50_ms"] else 0.0
+        flag = "  REGRESSION" if change > threshold else ""
+        if flag:
+            regressions.append(name)
+        print(f"{name:<42}{base['p50_ms']:>10.3f}{now['p50_ms']:>10.3f}{change:>+9.0%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the analysis hot paths.")
+    parser.add_argument("--sizes", default="300,1500,6000", help="Resume word counts")
+    parser.add_argument("--taxonomy", default="50,1000,5000", help="Skill taxonomy sizes")
+    parser.add_argument("--density", type=float, default=0.05, help="Share of words that are skills")
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--filter", default="", help="Only run cases containing this text")
+    parser.add_argument("--save", help="Write results JSON here (e.g. a baseline)")
+    parser.add_argument("--compare", help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="p50 slowdown counted as regression")
+    args = parser.parse_args(argv)
+
+    sizes = [int(x) for x in args.sizes.split(",") if x]
+    taxonomy_sizes = [int(x) for x in args.taxonomy.split(",") if x]
+    results = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "cases": {},
+    }
+    print(f"{'case':<42}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'ops/s':>10}{'peak KiB':>10}")
+    with tempfile.TemporaryDirectory(prefix="careercraft-bench-") as workdir:
+        for name, setup in cases(sizes, taxonomy_sizes, args.density, workdir):
+            if args.filter not in name:
+                continue
+            repeat = args.repeat if "pdf" not in name else max(3, args.repeat // 5)
+            r = results["cases"][name] = measure(setup(), repeat)
+            print(f"{name:<42}{r['p50_ms']:>9.3f}{r['p95_ms']:>9.3f}{r['p99_ms']:>9.3f}"
+                  f"{r['ops_per_s']:>10.1f}{r['peak_kib']:>10.0f}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            regressions = compare(results, json.load(fh), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# ---------------- COLD START / IMPORT COST ----------------
+#   python -m benchmarks.startup --save before.json
+#   ... change imports ...
+#   python -m benchmarks.startup --compare before.json
+# Every case runs in a fresh interpreter, so nothing is already imported;
+# reported times exclude interpreter start-up itself.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = {
+    # What a worker / headless caller pays up front
+    "import engine": "import engine",
+    "import batch": "import batch",
+    "import matcher": "import matcher",
+    # First use of each feature (loads its dependency on demand)
+    "engine: extract_skills": "import engine; engine.extract_skills('python sql docker')",
+    "engine: calculate_metrics": (
+        "import engine; engine.calculate_metrics('python sql', 'python java', {'python'}, {'python', 'java'})"
+    ),
+    "engine: cheat sheet": "import engine; engine.generate_cheat_sheet('A', 'B', {'python'}, {})",
+    # {docx} is the path of a small .docx fixture written by main()
+    "engine: docx": "import extractors; extractors.python_docx_text(open({docx}, 'rb').read())",
+    # Individual heavy dependencies (what app.py used to import eagerly)
+    "dep: streamlit": "import streamlit",
+    "dep: pdfplumber": "import pdfplumber",
+    "dep: docx": "import docx",
+    "dep: pandas": "import pandas",
+    "dep: sklearn TfidfVectorizer": "from sklearn.feature_extraction.text import TfidfVectorizer",
+    "dep: reportlab canvas": "from reportlab.pdfgen import canvas",
+    "dep: numpy": "import numpy",
+}
+
+_PROBE = "import time, sys\nt = time.perf_counter()\n{code}\nsys.stdout.write(repr(time.perf_counter() - t))\n"
+
+
+def measure(code, repeat):
+    samples = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", _PROBE.format(code=code)], cwd=ROOT,
+                             capture_output=True, text=True)
+        if out.returncode != 0:
+            return None
+        samples.append(float(out.stdout) * 1000)
+    return statistics.median(samples)
+
+
+def heaviest_imports(module, top=8):
+    """Direct imports of `module`, by cumulative -X importtime cost (ms)."""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=ROOT,
+                         capture_output=True, text=True)
+    children = []
+    for line in out.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2][1:]
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        if depth == 1:
+            children.append((int(parts[1]) / 1000, name.strip()))
+        elif depth == 0:
+            # importtime prints children before their parent
+            if name == module:
+                return sorted(children, reverse=True)[:top]
+            children = []
+    return []
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure import / cold-start cost per module.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--breakdown", default="engine", help="Module to break down with -X importtime")
+    parser.add_argument("--save", help="Write results JSON here")
+    parser.add_argument("--compare", help="Earlier results JSON (e.g. before a change)")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+
+    from benchmarks import generators as gen
+
+    results = {}
+    header = f"{'case':<32}{'ms':>9}" + (f"{'before':>9}{'change':>9}" if baseline else "")
+    print(header)
+    with tempfile.TemporaryDirectory(prefix="careercraft-startup-") as workdir:
+        docx_path = os.path.join(workdir, "resume.docx")
+        with open(docx_path, "wb") as fh:
+            fh.write(gen.docx_bytes(gen.resume(300, 0.1)))
+        for name, code in CASES.items():
+            ms = results[name] = measure(code.replace("{docx}", repr(docx_path)), args.repeat)
+            line = f"{name:<32}{'n/a' if ms is None else format(ms, '.1f'):>9}"
+            before = baseline.get(name)
+            if baseline and before and ms is not None:
+                line += f"{before:>9.1f}{(ms - before) / before:>+9.0%}"
+            print(line)
+
+    if args.breakdown:
+        print(f"\nheaviest imports under `import {args.breakdown}` (cumulative ms):")
+        for ms, name in heaviest_imports(args.breakdown):
+            print(f"  {ms:>8.1f}  {name}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
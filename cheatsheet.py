@@ -0,0 +1,137 @@
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+
+# ---------------- INTERVIEW CHEAT SHEET ----------------
+# The layout is compiled once into a template: every static line (rules,
+# headings, the closing hook, the keyword section) is a precomputed draw op
+# and only the candidate-specific slots are filled per render. PDFs are
+# rendered with invariant=1, so the same inputs give the same bytes and can
+# be cached by content hash.
+
+KEYWORDS = ["Scalability", "CI/CD Pipeline", "Latency Reduction", "State Management", "Unit Testing"]
+MAX_STORIES = 5
+
+
+def cheat_sheet_inputs(name, role, skills, bullets):
+    """Only what actually lands on the page (2 hook skills, first 5 stories)."""
+    stories = tuple((skill.upper(), bullet.replace("**", "")[:90] + "...")
+                    for skill, bullet in list(bullets.items())[:MAX_STORIES])
+    return name, role, tuple(list(skills)[:2]), stories
+
+
+def cheat_sheet_key(name, role, skills, bullets):
+    return hashlib.sha256(json.dumps(cheat_sheet_inputs(name, role, skills, bullets)).encode()).hexdigest()
+
+
+class CheatSheetTemplate:
+    def __init__(self, keywords=KEYWORDS):
+        from reportlab.lib.pagesizes import letter
+        from reportlab.pdfbase import pdfmetrics
+
+        self.pagesize = letter
+        # Resolve the three faces once instead of on the first draw of each render
+        for face in ("Helvetica", "Helvetica-Bold", "Helvetica-Oblique"):
+            pdfmetrics.getFont(face)
+        # (op, args) lists; y values in the tail block are relative to where
+        # the stories end, since that depends on how many stories there are
+        self.head = [
+            ("line", (50, 720, 550, 720)),
+            ("font", ("Helvetica-Bold", 14)),
+            ("text", (50, 690, "1. My Power Hooks")),
+            ("font", ("Helvetica", 12)),
+            ("text", (50, 650, "• \"I focus on performance optimization and clean architecture.\"")),
+            ("font", ("Helvetica-Bold", 14)),
+            ("text", (50, 610, "2. Project Stories (STAR Method)")),
+        ]
+        self.tail = [
+            ("font", ("Helvetica-Bold", 14)),
+            ("text", (50, -20, "3. Tech Keywords to Drop")),
+            ("font", ("Helvetica-Oblique", 12)),
+            ("text", (50, -45, ", ".join(keywords))),
+        ]
+
+    @staticmethod
+    def _play(c, ops, dy=0):
+        for op, args in ops:
+            if op == "text":
+                c.drawString(args[0], args[1] + dy, args[2])
+            elif op == "font":
+                c.setFont(*args)
+            else:
+                c.line(*args)
+
+    def render(self, name, role, skills, bullets):
+        from reportlab.pdfgen import canvas
+
+        name, role, hooks, stories = cheat_sheet_inputs(name, role, skills, bullets)
+        buffer = io.BytesIO()
+        c = canvas.Canvas(buffer, pagesize=self.pagesize, invariant=1)
+        c.setFont("Helvetica-Bold", 16)
+        c.drawString(50, 750, f"Interview Cheat Sheet: {name}")
+        c.setFont("Helvetica", 12)
+        c.drawString(50, 730, f"Target Role: {role}")
+        c.drawString(50, 670, f"• \"I specialize in {', '.join(hooks)} to build scalable apps.\"")
+        self._play(c, self.head)
+
+        y = 585
+        c.setFont("Helvetica", 10)
+        for skill, text in stories:
+            c.drawString(50, y, f"[{skill}]")
+            c.drawString(60, y - 15, text)
+            y -= 35
+        self._play(c, self.tail, dy=y)
+
+        c.save()
+        return buffer.getvalue()
+
+
+_template = None
+
+
+def default_template():
+    global _template
+    if _template is None:
+        _template = CheatSheetTemplate()
+    return _template
+
+
+def iter_cheat_sheets(candidates, bullets, template=None):
+    """Yield (candidate_id, pdf_bytes) one at a time, so a cohort never sits in memory."""
+    template = template or default_template()
+    for candidate in candidates:
+        yield candidate["id"], template.render(
+            candidate.get("name", "Candidate"), candidate.get("role", "General"),
+            candidate.get("skills", []), bullets)
+
+
+def main(argv=None):
+    from engine import configure_taxonomy
+
+    parser = argparse.ArgumentParser(description="Render cheat sheets for a cohort.")
+    parser.add_argument("--input", required=True,
+                        help='JSONL of {"id", "name", "role", "skills": [...]} per candidate')
+    parser.add_argument("--out-dir", required=True)
+    parser.add_argument("--taxonomy", help="Taxonomy source for the resume bullets (default: built-in)")
+    args = parser.parse_args(argv)
+
+    bullets = configure_taxonomy(args.taxonomy).resume_bullets
+    os.makedirs(args.out_dir, exist_ok=True)
+    started, count = time.perf_counter(), 0
+    with open(args.input, encoding="utf-8") as fh:
+        candidates = (json.loads(line) for line in fh if line.strip())
+        for candidate_id, pdf in iter_cheat_sheets(candidates, bullets):
+            with open(os.path.join(args.out_dir, f"{candidate_id}.pdf"), "wb") as out:
+                out.write(pdf)
+            count += 1
+    elapsed = time.perf_counter() - started
+    print(f"Rendered {count} cheat sheets in {elapsed:.2f}s ({count / max(elapsed, 1e-9):.0f}/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
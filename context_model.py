@@ -0,0 +1,49 @@
+import pickle
+
+import numpy as np
+
+# ---------------- CORPUS-LEVEL CONTEXT SCORING ----------------
+# One TfidfVectorizer is fitted over a reference corpus of JDs (so IDF means
+# something) and persisted. Workers load it and only ever call transform();
+# scoring many resumes against many JDs is then a single sparse product.
+
+MIN_C_SCORE = 15  # same floor calculate_metrics applies
+
+
+def to_c_scores(similarity):
+    """Cosine similarities -> int context scores, floored like calculate_metrics."""
+    return np.maximum((np.asarray(similarity) * 100).astype(int), MIN_C_SCORE)
+
+
+class ContextModel:
+    def __init__(self, vectorizer):
+        self.vectorizer = vectorizer
+
+    @classmethod
+    def fit(cls, corpus):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        vectorizer = TfidfVectorizer(stop_words='english')
+        vectorizer.fit(list(corpus))
+        return cls(vectorizer)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as fh:
+            return cls(pickle.load(fh))
+
+    def save(self, path):
+        with open(path, 'wb') as fh:
+            pickle.dump(self.vectorizer, fh, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def transform(self, texts):
+        # Rows are L2-normalised, so a dot product is the cosine similarity
+        return self.vectorizer.transform(list(texts))
+
+    def similarity(self, resumes, jds):
+        """Dense (n_resumes, n_jds) cosine matrix; accepts texts or transformed matrices."""
+        r = resumes if hasattr(resumes, 'shape') else self.transform(resumes)
+        j = jds if hasattr(jds, 'shape') else self.transform(jds)
+        return (r @ j.T).toarray()
+
+    def c_scores(self, resumes, jds):
+        return to_c_scores(self.similarity(resumes, jds))
@@ -0,0 +1,297 @@
+import hashlib
+import io
+import os
+import threading
+from collections import namedtuple
+from text_cache import TextCache, content_key
+from lru import LRUCache
+import metrics
+from extractors import ExtractionLimits, ExtractionResult, limits_tag, extract_bytes
+from taxonomy import Taxonomy, TaxonomyFile
+
+# pdfplumber, python-docx, scikit-learn and reportlab are imported inside the
+# functions that use them: importing engine stays cheap for batch workers and
+# headless callers (python -m benchmarks.startup shows the breakdown).
+
+# ---------------- 1. INTELLIGENT DATABASES ----------------
+
+SKILL_DB = {
+    "Frontend": ["javascript", "react", "angular", "vue", "html", "css", "tailwind", "redux", "typescript", "figma", "jest", "next.js"],
+    "Backend": ["python", "django", "flask", "node.js", "express", "java", "spring boot", "go", "c#", ".net"],
+    "Database": ["sql", "mysql", "postgresql", "mongodb", "redis", "firebase", "elasticsearch"],
+    "DevOps": ["aws", "docker", "kubernetes", "jenkins", "git", "ci/cd", "linux", "terraform", "azure"],
+    "Data": ["pandas", "numpy", "scikit-learn", "tensorflow", "pytorch", "tableau", "power bi", "excel", "spark"]
+}
+
+# MICRO-PROJECT BLUEPRINTS (Platinum Standard)
+PROJECT_BLUEPRINTS = {
+    "react": {"title": "Trello Clone (Kanban)", "task": "Build a Drag-and-Drop Task Board using **React DnD** and **Redux Toolkit**.", "salary": "₹4 LPA"},
+    "next.js": {"title": "SSR Blog Platform", "task": "Build a Server-Side Rendered (SSR) Blog using **getStaticProps** to optimize SEO performance.", "salary": "₹5 LPA"},
+    "jest": {"title": "Login Unit Tests", "task": "Write a Unit Test Suite for a Login Form that validates email formats and mocks the API response.", "salary": "₹3 LPA"},
+    "spring boot": {"title": "Bookstore REST API", "task": "Build a comprehensive API with CRUD operations, connecting to a local **H2 Database** and handling exceptions.", "salary": "₹6 LPA"},
+    "typescript": {"title": "Strictly Typed Calculator", "task": "Convert a JS Calculator to **TypeScript**, enforcing strict types on all event handlers.", "salary": "₹3 LPA"},
+    "figma": {"title": "Dark Mode Dashboard UI", "task": "Design a 'Login & Dashboard' UI kit (Dark Mode) demonstrating **Component Variants** and **Auto-Layout**.", "salary": "₹2 LPA"},
+    "python": {"title": "Crypto Price Tracker", "task": "Build a script using **Requests & Pandas** to fetch live BTC prices and calculate moving averages.", "salary": "₹4 LPA"},
+    "sql": {"title": "E-Commerce Schema (3NF)", "task": "Design a normalized DB for an Amazon clone. Write a query to find 'Top 3 Spenders' using **JOINs**.", "salary": "₹3 LPA"},
+    "aws": {"title": "Serverless API", "task": "Deploy a 'Hello World' function on **AWS Lambda** triggered by API Gateway.", "salary": "₹7 LPA"},
+    "docker": {"title": "Microservice Dockerfile", "task": "Write a multi-stage **Dockerfile** for a Python app to reduce image size by 40%.", "salary": "₹5 LPA"},
+    "git": {"title": "Simulate Merge Conflict", "task": "Create two branches, edit the same line in both, and resolve the conflict using **Git CLI**.", "salary": "₹2 LPA"},
+    "redux": {"title": "Shopping Cart State", "task": "Implement a global Shopping Cart using **Redux**, handling add/remove actions.", "salary": "₹4 LPA"},
+    "html": {"title": "Accessible Landing Page", "task": "Refactor a `div`-heavy page into **Semantic HTML** (<nav>, <article>, <main>) to score 100 on Lighthouse.", "salary": "₹1 LPA"}
+}
+
+# DYNAMIC INTERVIEW QUESTIONS
+INTERVIEW_Q = {
+    "react": "Recruiter: I see you built a Trello Clone. How did you optimize rendering to prevent lag when dragging items? Did you use `React.memo`?",
+    "next.js": "Recruiter: Explain the trade-off between **SSR (Server-Side Rendering)** and **ISR (Incremental Static Regeneration)** in your blog.",
+    "jest": "Recruiter: How did you calculate **Code Coverage**? Did you focus on statement coverage or branch coverage?",
+    "spring boot": "Recruiter: How did you handle **Dependency Injection** for your Service and Repository layers? Why use Constructor Injection?",
+    "typescript": "Recruiter: What specific bugs did strict typing catch that you missed in JS? How did you handle `any` types?",
+    "figma": "Recruiter: Walk me through your Dark Mode system. How did you handle color tokens for accessibility?",
+    "python": "Recruiter: In your Crypto Tracker, how would you handle a sudden API rate limit error without crashing the script?",
+    "sql": "Recruiter: Why did you choose 3rd Normal Form? When would you intentionally denormalize this data for read performance?",
+    "aws": "Recruiter: Since you used **AWS Lambda**, how did you manage **Cold Starts**, and why did you choose API Gateway over a Load Balancer?",
+    "docker": "Recruiter: You reduced image size by 40%. Did you use **Alpine Linux** images? What were the security trade-offs of that decision?",
+    "git": "Recruiter: Explain a situation where you chose 'Git Rebase' over 'Git Merge'. How did you handle the history rewrite safety?",
+    "html": "Recruiter: Explain the importance of **Semantic HTML** (like `<article>` vs `<div>`) for accessibility."
+}
+
+# RESUME BULLETS
+RESUME_BULLETS = {
+    "react": "Architected a Trello-style Kanban board using React, utilizing Redux for state management of 50+ tasks.",
+    "next.js": "Engineered a Server-Side Rendered (SSR) blog using Next.js, improving SEO indexing and FCP by 40%.",
+    "jest": "Implemented Unit Testing suites using Jest, achieving 100% code coverage for critical authentication modules.",
+    "spring boot": "Developed a scalable RESTful API for a Bookstore using Spring Boot, implementing H2 persistence and custom error handling.",
+    "typescript": "Refactored a legacy codebase to TypeScript, reducing runtime type errors by 90% through strict typing.",
+    "figma": "Designed a scalable Dark Mode UI System in Figma, utilizing Auto-Layout and Variants to speed up dev handoff.",
+    "python": "Developed a financial data pipeline using Python (Pandas), automating real-time crypto analysis.",
+    "aws": "Deployed a serverless architecture on AWS Lambda, optimizing API Gateway triggers for <100ms latency.",
+    "docker": "Optimized container orchestration using multi-stage Dockerfiles, reducing production image size by 40%."
+}
+
+# ALIASES -> canonical SKILL_DB names
+SKILL_ALIASES = {
+    "k8s": "kubernetes", "postgres": "postgresql", "mongo": "mongodb", "golang": "go",
+    "reactjs": "react", "react.js": "react",
+    "vuejs": "vue", "vue.js": "vue", "nextjs": "next.js", "nodejs": "node.js",
+    "sklearn": "scikit-learn", "powerbi": "power bi", "amazon web services": "aws",
+}
+
+# The built-in taxonomy is the databases above. CAREERCRAFT_TAXONOMY points at
+# a JSON/YAML/CSV source instead (compiled to an artifact, hot-reloaded; see
+# taxonomy.py); sections it leaves out fall back to the built-in ones.
+BUILTIN_TAXONOMY = Taxonomy(SKILL_DB, SKILL_ALIASES, PROJECT_BLUEPRINTS, INTERVIEW_Q, RESUME_BULLETS)
+_taxonomy_file = None
+
+def configure_taxonomy(source=None, check_interval=None):
+    global _taxonomy_file
+    source = source or os.environ.get("CAREERCRAFT_TAXONOMY")
+    if check_interval is None:
+        check_interval = float(os.environ.get("CAREERCRAFT_TAXONOMY_CHECK", "2"))
+    _taxonomy_file = TaxonomyFile(source, check_interval, defaults=BUILTIN_TAXONOMY) if source else False
+    return current_taxonomy()
+
+def current_taxonomy():
+    if _taxonomy_file is None:
+        configure_taxonomy()
+    return _taxonomy_file.get() if _taxonomy_file else BUILTIN_TAXONOMY
+
+# ---------------- 2. LOGIC ENGINES ----------------
+
+# Parsed text keyed by file-content hash. Size via CAREERCRAFT_TEXT_CACHE_MB;
+# set CAREERCRAFT_TEXT_CACHE_DIR to share a disk tier between processes.
+TEXT_CACHE = TextCache(
+    max_bytes=int(os.environ.get("CAREERCRAFT_TEXT_CACHE_MB", "64")) * 2**20,
+    directory=os.environ.get("CAREERCRAFT_TEXT_CACHE_DIR") or None,
+)
+
+def configure_text_cache(max_bytes=None, directory=None):
+    global TEXT_CACHE
+    TEXT_CACHE = TextCache(max_bytes or TEXT_CACHE.max_bytes, directory)
+    return TEXT_CACHE
+
+# Per-file limits for uploads. PDFs are parsed in CAREERCRAFT_PDF_WORKERS
+# killable worker processes shared fairly between files (default: one per
+# CAREERCRAFT_JOB_WORKERS analysis thread), so the timeout also holds inside a
+# single page; 0 parses in-process and only checks it between pages.
+# CAREERCRAFT_ENOUGH_CHARS stops reading once that much text is in.
+EXTRACTION_LIMITS = ExtractionLimits(
+    max_pages=int(os.environ.get("CAREERCRAFT_MAX_PAGES", "50")),
+    max_bytes=int(os.environ.get("CAREERCRAFT_MAX_UPLOAD_MB", "20")) * 2**20,
+    timeout=float(os.environ.get("CAREERCRAFT_EXTRACT_TIMEOUT", "30")),
+    enough_chars=int(os.environ.get("CAREERCRAFT_ENOUGH_CHARS", "0")) or None,
+)
+PDF_WORKERS = int(os.environ.get("CAREERCRAFT_PDF_WORKERS") or os.environ.get("CAREERCRAFT_JOB_WORKERS") or 4)
+_pdf_pool = None
+_pdf_pool_lock = threading.Lock()
+
+def configure_extraction(enough_chars=None, pdf_workers=None):
+    """Override the env-configured early stop / PDF worker count (batch.py flags)."""
+    global EXTRACTION_LIMITS, PDF_WORKERS
+    if enough_chars is not None:
+        EXTRACTION_LIMITS = EXTRACTION_LIMITS._replace(enough_chars=enough_chars or None)
+    if pdf_workers is not None:
+        PDF_WORKERS = pdf_workers
+    return EXTRACTION_LIMITS
+
+def _get_pdf_pool():
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None and PDF_WORKERS > 0:
+            from extractors import PdfPool
+            _pdf_pool = PdfPool(PDF_WORKERS)
+        return _pdf_pool
+
+def extract_document(file, limits=None, cancelled=None):
+    """Extract an uploaded/opened file; returns an ExtractionResult with timing and errors.
+    cancelled() is polled while a PDF is parsed and stops it early."""
+    limits = limits or EXTRACTION_LIMITS
+    kind = os.path.splitext(file.name)[1].lower()
+    data = file.getvalue() if hasattr(file, 'getvalue') else file.read()
+    with metrics.stage("extract_text", kind=kind, bytes=len(data)) as timing:
+        key = content_key(data, kind + limits_tag(limits))
+        text = TEXT_CACHE.get(key)
+        if text is not None:
+            timing.count(cached=1, chars=len(text))
+            return ExtractionResult(text, None, 0.0, None, False, cached=True)
+        result = extract_bytes(data, kind, limits, pool=_get_pdf_pool() if kind == '.pdf' else None,
+                               cancelled=cancelled)
+        timing.count(cached=0, pages=result.pages or 0, chars=len(result.text), failed=int(result.error is not None))
+        if result.error is None:
+            TEXT_CACHE.put(key, result.text)
+        return result
+
+def extract_text(file):
+    return extract_document(file).text
+
+def extract_skills(text):
+    """Canonical names of the taxonomy skills in text (one pass, aliases folded in)."""
+    with metrics.stage("extract_skills", chars=len(text)) as timing:
+        found = current_taxonomy().find(text)
+        timing.count(skills=len(found))
+        return found
+
+def skill_space():
+    """Taxonomy skills as bit positions for cohort-scale gap analysis (skill_vectors.py)."""
+    return current_taxonomy().space()
+
+def keyword_score(r_skills, j_skills):
+    return int((len(r_skills.intersection(j_skills)) / len(j_skills)) * 100)
+
+def blend_score(k_score, c_score):
+    return int((k_score * 0.6) + (c_score * 0.4))
+
+def pairwise_c_score(resume_text, jd_text):
+    # Legacy context score: IDF fitted on just this pair. Kept for regression
+    # comparison against the corpus-level ContextModel.
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
+    tfidf = TfidfVectorizer(stop_words='english')
+    try:
+        matrix = tfidf.fit_transform([resume_text, jd_text])
+        raw_c_score = int(cosine_similarity(matrix[0:1], matrix[1:2])[0][0] * 100)
+    except: raw_c_score = 0
+    return max(raw_c_score, 15)
+
+def calculate_metrics(resume_text, jd_text, r_skills, j_skills, context_model=None):
+    if not j_skills: return 0, 0, 15 
+    with metrics.stage("calculate_metrics", chars=len(resume_text) + len(jd_text)):
+        k_score = keyword_score(r_skills, j_skills)
+        if context_model is None:
+            c_score = pairwise_c_score(resume_text, jd_text)
+        else:
+            c_score = int(context_model.c_scores([resume_text], [jd_text])[0, 0])
+        final = blend_score(k_score, c_score)
+        return final, k_score, c_score
+
+def analyze_answer(answer):
+    from answers import analyze_answer
+    return analyze_answer(answer)
+
+def generate_cheat_sheet(name, role, skills, bullets):
+    from cheatsheet import default_template
+    with metrics.stage("generate_cheat_sheet", skills=len(skills)) as timing:
+        pdf = default_template().render(name, role, skills, bullets)
+        timing.count(bytes=len(pdf))
+        return io.BytesIO(pdf)
+
+# ---------------- 3. MEMOIZED ANALYSIS ----------------
+# Everything derived from (resume, JD, role) is computed once and shared by
+# all sessions; Streamlit reruns only pay for a dictionary lookup.
+
+Analysis = namedtuple("Analysis", "key r_skills j_skills matched missing final k_score c_score")
+
+ANALYSIS_CACHE = LRUCache(int(os.environ.get("CAREERCRAFT_ANALYSIS_CACHE_SIZE", "512")))
+CHEAT_SHEET_CACHE = LRUCache(int(os.environ.get("CAREERCRAFT_CHEAT_SHEET_CACHE_SIZE", "128")))
+
+def analysis_key(resume_text, jd_text, role_title):
+    h = hashlib.sha256()
+    # A taxonomy reload changes what the same texts analyse to
+    for part in (current_taxonomy().version, resume_text, jd_text, role_title):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+def _no_progress(stage, fraction):
+    pass
+
+def _run_analysis(key, resume_text, jd_text, progress=_no_progress):
+    progress("matching", 0.35)
+    r_skills = frozenset(extract_skills(resume_text))
+    j_skills = frozenset(extract_skills(jd_text.lower()))
+    progress("scoring", 0.6)
+    final, k_score, c_score = calculate_metrics(resume_text, jd_text, r_skills, j_skills)
+    return Analysis(key, r_skills, j_skills, r_skills & j_skills, j_skills - r_skills, final, k_score, c_score)
+
+def analyze(resume_text, jd_text, role_title, key=None, progress=_no_progress):
+    """Cached analysis; pass a precomputed key to skip re-hashing the texts."""
+    key = key or analysis_key(resume_text, jd_text, role_title)
+    return ANALYSIS_CACHE.get_or_compute(key, lambda: _run_analysis(key, resume_text, jd_text, progress))
+
+def cheat_sheet_bytes(analysis, role_title, name="Candidate"):
+    """Rendered on first download only; keyed by what is drawn, so analyses that
+    put the same content on the page share one PDF."""
+    from cheatsheet import cheat_sheet_key
+    bullets = current_taxonomy().resume_bullets
+    return CHEAT_SHEET_CACHE.get_or_compute(
+        cheat_sheet_key(name, role_title, analysis.matched, bullets),
+        lambda: generate_cheat_sheet(name, role_title, analysis.matched, bullets).getvalue(),
+    )
+
+# ---------------- 4. BACKGROUND PIPELINE ----------------
+# Body of an analysis job (see jobs.py): every progress() call reports the
+# stage to the UI and is the point where a superseded job stops. PDF parsing
+# also polls cancelled(), so a superseded upload frees its parser workers
+# without waiting for the parse to finish.
+
+class Upload(io.BytesIO):
+    """Uploaded bytes with a filename, detached from Streamlit's UploadedFile."""
+    def __init__(self, data, name):
+        super().__init__(data)
+        self.name = name
+
+def analysis_pipeline(progress, cancelled, resume, jd_text, role_title):
+    """resume is pasted text or a (filename, bytes) upload; returns what the dashboard needs."""
+    with metrics.run("analysis_job") as run:
+        extraction = None
+        if isinstance(resume, str):
+            resume_text = resume
+        else:
+            progress("parsing", 0.1)
+            extraction = extract_document(Upload(resume[1], resume[0]), cancelled=cancelled)
+            progress("parsing", 0.2)  # a cancelled parse ends the job here, not as a failure
+            if extraction.error:
+                raise ValueError(f"Could not read this file ({extraction.error}). Try Paste Text instead.")
+            resume_text = extraction.text
+            if not resume_text.strip():
+                raise ValueError("No text found in this file (scanned image?). Try Paste Text instead.")
+        key = analysis_key(resume_text, jd_text, role_title)
+        analyze(resume_text, jd_text, role_title, key=key, progress=progress)
+    return {
+        "resume_text": resume_text,
+        "jd_text": jd_text,
+        "role_title": role_title,
+        "analysis_key": key,
+        "extraction": extraction,
+        "metrics": run.as_dict() if run is not None else None,
+    }
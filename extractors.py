@@ -0,0 +1,392 @@
+import io
+import multiprocessing
+import threading
+import time
+import zipfile
+from multiprocessing.connection import wait as wait_ready
+from xml.etree import ElementTree
+from collections import namedtuple
+
+# ---------------- DOCUMENT EXTRACTION ----------------
+# PDFs are streamed page by page, never concatenated with +=, and every call
+# reports what happened instead of swallowing errors:
+#   * max_pages / max_bytes cap the work a single upload can cause
+#   * timeout is a per-file budget
+#   * enough_chars stops early once scoring has enough text to work with
+#   * cancelled() is polled while parsing; a superseded job stops its file
+# In-process, the timeout can only be checked between pages. A PdfPool runs
+# the parsing in worker processes that are killed (and replaced) when a file
+# overruns, so one pathological page cannot hold anything past the deadline,
+# and shares them between concurrent files so a long PDF cannot hold them all.
+
+ExtractionLimits = namedtuple(
+    "ExtractionLimits", "max_pages max_bytes timeout enough_chars",
+    defaults=(50, 20 * 2**20, 30.0, None),
+)
+
+ExtractionResult = namedtuple(
+    "ExtractionResult", "text pages seconds error truncated cached",
+    defaults=(False,),
+)
+
+DEFAULT_LIMITS = ExtractionLimits()
+
+
+class ExtractionError(Exception):
+    pass
+
+
+def limits_tag(limits):
+    # Part of the cache key: the same bytes under different limits may differ
+    return "|{}|{}|{}".format(limits.max_pages, limits.max_bytes, limits.enough_chars)
+
+
+def _close_page(page):
+    # Drop pdfminer's layout objects as soon as the page's text is out
+    close = getattr(page, "close", None) or getattr(page, "flush_cache", None)
+    if close:
+        close()
+
+
+def iter_pdf_pages(data, start=0, stop=None):
+    """Yield the text of each page in [start, stop) without holding earlier pages."""
+    import pdfplumber
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        for page in pdf.pages[start:stop]:
+            try:
+                yield page.extract_text() or ""
+            finally:
+                _close_page(page)
+
+
+def _check_size(data, limits):
+    if limits.max_bytes and len(data) > limits.max_bytes:
+        raise ExtractionError(f"file is {len(data)} bytes, limit is {limits.max_bytes}")
+
+
+def _stream_pdf(data, limits, deadline, cancelled=None):
+    """Sequential path: (parts, pages, truncated)."""
+    import pdfplumber
+    parts, chars, pages = [], 0, 0
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        total = len(pdf.pages)
+        for page in pdf.pages[:limits.max_pages or None]:
+            try:
+                text = page.extract_text() or ""
+            finally:
+                _close_page(page)
+            parts.append(text)
+            chars += len(text)
+            pages += 1
+            if limits.enough_chars and chars >= limits.enough_chars:
+                return parts, pages, pages < total
+            if deadline and time.monotonic() > deadline:
+                raise ExtractionError(f"timed out after {pages} pages")
+            if cancelled and cancelled():
+                raise ExtractionError(f"cancelled after {pages} pages")
+    return parts, pages, pages < total
+
+
+# ---- killable PDF workers ----
+# Protocol over a Pipe: the parent sends ("open", data), then ("page", i) one
+# page at a time, then ("close",); the worker answers ("opened", total),
+# ("page", i, text) and ("closed",), or ("error", message). Handing out pages
+# one by one lets a file give workers back between pages.
+
+def _pdf_worker(conn):
+    pdf = None
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            if message[0] == "open":
+                import pdfplumber
+                pdf = pdfplumber.open(io.BytesIO(message[1]))
+                conn.send(("opened", len(pdf.pages)))
+            elif message[0] == "page":
+                page = pdf.pages[message[1]]
+                try:
+                    text = page.extract_text() or ""
+                finally:
+                    _close_page(page)
+                conn.send(("page", message[1], text))
+            else:
+                closing, pdf = pdf, None
+                try:
+                    if closing is not None:
+                        closing.close()
+                finally:
+                    conn.send(("closed",))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+class PdfPool:
+    """Worker processes for PDF parsing, shared fairly between files.
+
+    A file gets at most its share of the workers (workers / files parsing or
+    waiting, rounded up) and hands them pages one at a time, in order, so
+    enough_chars can stop it early. While other files wait, a file over its
+    share gives workers back between pages; when nobody waits it takes idle
+    ones. Files are served in arrival order and their timeout starts once
+    they have a worker. Workers still busy past the deadline are terminated
+    and replaced.
+    """
+
+    def __init__(self, workers=1):
+        self.workers = max(1, workers)
+        self._ctx = multiprocessing.get_context()
+        self._cond = threading.Condition()
+        self._idle = [self._start() for _ in range(self.workers)]
+        self._draining = []  # (worker, deadline): sent "close", "closed" not read yet
+        self._waiting = []   # files queued for a worker, oldest first
+        self._files = 0      # files holding workers
+        self.killed = 0
+
+    def _start(self):
+        conn, child = self._ctx.Pipe()
+        proc = self._ctx.Process(target=_pdf_worker, args=(child,), daemon=True)
+        proc.start()
+        child.close()
+        return proc, conn
+
+    def _kill(self, worker):
+        proc, conn = worker
+        proc.terminate()
+        proc.join(1)
+        conn.close()
+        self.killed += 1
+        return self._start()
+
+    def _share(self):
+        return -(-self.workers // max(1, self._files + len(self._waiting)))
+
+    def _reap(self):
+        # Called with the lock held: draining workers that have closed their
+        # file go back to idle; ones still busy past their deadline are replaced
+        now, still = time.monotonic(), []
+        for worker, deadline in self._draining:
+            try:
+                closed = False
+                while worker[1].poll():
+                    if worker[1].recv()[0] == "closed":
+                        closed = True
+                        break
+            except (EOFError, OSError):
+                self._idle.append(self._kill(worker))
+                continue
+            if closed:
+                self._idle.append(worker)
+            elif now > deadline:
+                self._idle.append(self._kill(worker))
+            else:
+                still.append((worker, deadline))
+        self._draining = still
+
+    def _acquire(self, cancelled):
+        with self._cond:
+            ticket = object()
+            self._waiting.append(ticket)
+            try:
+                while True:
+                    self._reap()
+                    if self._idle and self._waiting[0] is ticket:
+                        share = self._share()
+                        taken, self._idle = self._idle[:share], self._idle[share:]
+                        self._files += 1
+                        return taken
+                    if cancelled and cancelled():
+                        raise ExtractionError("cancelled while waiting for a PDF worker")
+                    self._cond.wait(0.05)
+            finally:
+                self._waiting.remove(ticket)
+                self._cond.notify_all()
+
+    def _give_back(self, held):
+        with self._cond:
+            return bool(self._waiting) and held > self._share()
+
+    def _take_more(self, held):
+        with self._cond:
+            if self._waiting:
+                return []
+            self._reap()
+            n = max(0, min(len(self._idle), self._share() - held))
+            taken, self._idle = self._idle[:n], self._idle[n:]
+            return taken
+
+    def _release(self, workers, kill):
+        with self._cond:
+            for worker in workers:
+                if kill:
+                    self._idle.append(self._kill(worker))
+                    continue
+                try:
+                    worker[1].send(("close",))
+                except OSError:
+                    self._idle.append(self._kill(worker))
+                    continue
+                self._draining.append((worker, time.monotonic() + 30))
+            self._cond.notify_all()
+
+    def extract(self, data, limits, cancelled=None):
+        """(parts, pages, truncated), like the in-process path."""
+        busy = {}  # conn -> worker, each with one request outstanding
+        for worker in self._acquire(cancelled):
+            worker[1].send(("open", data))
+            busy[worker[1]] = worker
+        deadline = time.monotonic() + limits.timeout if limits.timeout else None
+        texts, parts, chars, total, stop, handed, kill = {}, [], 0, None, 0, 0, False
+        try:
+            while busy:
+                remaining = deadline - time.monotonic() if deadline else None
+                if remaining is not None and remaining <= 0:
+                    kill = True
+                    raise ExtractionError(f"timed out after {len(parts)} pages")
+                if cancelled:
+                    if cancelled():
+                        kill = True
+                        raise ExtractionError(f"cancelled after {len(parts)} pages")
+                    remaining = min(remaining, 0.1) if remaining is not None else 0.1
+                for conn in wait_ready(list(busy), remaining):
+                    try:
+                        message = conn.recv()
+                    except (EOFError, OSError):
+                        kill = True
+                        raise ExtractionError("PDF worker exited") from None
+                    if message[0] == "error":
+                        raise ExtractionError(message[1])
+                    if message[0] == "opened":
+                        total = message[1]
+                        stop = min(total, limits.max_pages or total)
+                    else:
+                        texts[message[1]] = message[2]
+                    # Stitch whatever is contiguous from the first page
+                    while len(parts) in texts:
+                        text = texts.pop(len(parts))
+                        parts.append(text)
+                        chars += len(text)
+                    if limits.enough_chars and chars >= limits.enough_chars:
+                        return parts, len(parts), len(parts) < total
+                    if handed < stop and not self._give_back(len(busy)):
+                        conn.send(("page", handed))
+                        handed += 1
+                    else:
+                        self._release([busy.pop(conn)], False)
+                if stop - handed > len(busy):
+                    for worker in self._take_more(len(busy)):
+                        worker[1].send(("open", data))
+                        busy[worker[1]] = worker
+            return parts, len(parts), len(parts) < total
+        finally:
+            # Overrun, cancelled or crashed: kill whatever is still parsing. Otherwise
+            # (early stop, parse error) the workers are asked to close the file
+            self._release(list(busy.values()), kill)
+            with self._cond:
+                self._files -= 1
+                self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            for proc, conn in self._idle + [w for w, _ in self._draining]:
+                proc.terminate()
+                conn.close()
+            self._idle, self._draining = [], []
+
+
+def extract_pdf(data, limits=DEFAULT_LIMITS, pool=None, cancelled=None):
+    started = time.monotonic()
+    try:
+        _check_size(data, limits)
+        if pool is None:
+            deadline = started + limits.timeout if limits.timeout else None
+            parts, pages, truncated = _stream_pdf(data, limits, deadline, cancelled)
+        else:
+            parts, pages, truncated = pool.extract(data, limits, cancelled)
+    except Exception as e:
+        return ExtractionResult("", 0, time.monotonic() - started, f"{type(e).__name__}: {e}", False)
+    return ExtractionResult("".join(parts), pages, time.monotonic() - started, None, truncated)
+
+
+# ---------------- DOCX (STREAMING XML) ----------------
+# Reads word/document.xml plus headers/footers straight out of the zip with
+# iterparse. Unlike docx.Document(...).paragraphs this also covers tables and
+# text boxes, and processed blocks are cleared so memory stays flat.
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+_BLOCKS = (_W + "p", _W + "tbl")
+
+
+def _docx_parts(names):
+    headers = sorted(n for n in names if n.startswith("word/header") and n.endswith(".xml"))
+    footers = sorted(n for n in names if n.startswith("word/footer") and n.endswith(".xml"))
+    return headers + ["word/document.xml"] + footers
+
+
+def _iter_part_paragraphs(fh):
+    stack, paragraphs, fallback = [], [], 0
+    for event, elem in ElementTree.iterparse(fh, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            stack.append(elem)
+            if tag == _MC_FALLBACK:
+                fallback += 1  # VML copy of a text box we already read
+            elif tag == _W + "p" and not fallback:
+                paragraphs.append([])
+            continue
+        stack.pop()
+        if tag == _MC_FALLBACK:
+            fallback -= 1
+        elif fallback:
+            pass
+        elif tag == _W + "t" and paragraphs:
+            paragraphs[-1].append(elem.text or "")
+        elif tag == _W + "tab" and paragraphs:
+            paragraphs[-1].append("\t")
+        elif tag in (_W + "br", _W + "cr") and paragraphs:
+            paragraphs[-1].append("\n")
+        elif tag == _W + "p":
+            yield "".join(paragraphs.pop())
+        if tag in _BLOCKS and stack and not any(e.tag in _BLOCKS for e in stack):
+            stack[-1].clear()
+
+
+def iter_docx_paragraphs(data):
+    """Yield paragraph text (headers, body incl. tables/text boxes, footers)."""
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        names = set(zf.namelist())
+        for part in _docx_parts(names):
+            if part in names:
+                with zf.open(part) as fh:
+                    yield from _iter_part_paragraphs(fh)
+
+
+def python_docx_text(data):
+    import docx
+    doc = docx.Document(io.BytesIO(data))
+    return "".join(p.text + "\n" for p in doc.paragraphs)
+
+
+def extract_docx(data, limits=DEFAULT_LIMITS):
+    started = time.monotonic()
+    try:
+        _check_size(data, limits)
+        try:
+            text = "".join(p + "\n" for p in iter_docx_paragraphs(data))
+        except (zipfile.BadZipFile, ElementTree.ParseError, KeyError):
+            text = python_docx_text(data)  # fallback for odd packages
+    except Exception as e:
+        return ExtractionResult("", 0, time.monotonic() - started, f"{type(e).__name__}: {e}", False)
+    return ExtractionResult(text, None, time.monotonic() - started, None, False)
+
+
+def extract_bytes(data, kind, limits=DEFAULT_LIMITS, pool=None, cancelled=None):
+    """Dispatch on file extension ('.pdf' / '.docx'); always returns an ExtractionResult."""
+    if kind == '.pdf':
+        return extract_pdf(data, limits, pool, cancelled)
+    if kind == '.docx':
+        return extract_docx(data, limits)
+    return ExtractionResult("", 0, 0.0, f"unsupported file type {kind!r}", False)
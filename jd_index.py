@@ -0,0 +1,206 @@
+import argparse
+import pickle
+import sys
+import time
+
+import numpy as np
+import scipy.sparse as sp
+
+from context_model import ContextModel, MIN_C_SCORE
+from engine import extract_skills
+
+# ---------------- JOB DESCRIPTION INDEX ----------------
+# Ranks one resume against a large stored JD corpus:
+#   * an inverted index (sparse JD x skill incidence matrix; its columns are
+#     the posting lists) gives every keyword overlap in one sparse product
+#   * a sparse TF-IDF matrix (vectorizer fitted once) gives every context
+#     score the same way
+# Both are blended exactly like calculate_metrics (60% keyword, 40% context).
+# Adds append row blocks and removes leave tombstones, so nothing is
+# refitted; tombstoned rows are compacted away once they pass COMPACT_RATIO.
+
+COMPACT_RATIO = 0.25
+
+
+def _stack(matrix, pending, n_cols):
+    parts = ([matrix] if matrix is not None else []) + pending
+    if not parts:
+        return sp.csr_matrix((0, n_cols))
+    for part in parts:
+        if part.shape[1] < n_cols:
+            part.resize((part.shape[0], n_cols))
+    return sp.vstack(parts, format="csr")
+
+
+class JDIndex:
+    def __init__(self, model):
+        self.model = model
+        self.ids = []            # row -> jd_id
+        self.rows = {}           # jd_id -> row
+        self.skills = []         # row -> frozenset of skills
+        self.skill_ids = {}      # skill -> incidence column
+        self._alive = []         # row -> bool
+        self._tfidf = None       # stacked TF-IDF rows
+        self._incidence = None   # stacked JD x skill 0/1 rows
+        self._pending = []       # (tfidf block, incidence block) added since the last query
+        self._removed = 0
+
+    @classmethod
+    def build(cls, jds, model=None):
+        """jds: iterable of (jd_id, text). Fits the vectorizer unless one is given."""
+        jds = list(jds)
+        index = cls(model or ContextModel.fit(text for _, text in jds))
+        index.add_many(jds)
+        return index
+
+    def __len__(self):
+        return len(self.rows)
+
+    # ---- updates ----
+    def add_many(self, jds):
+        # Repeated ids within the batch collapse to the last text, like
+        # re-adding an id that is already indexed
+        jds = list(dict(jds).items())
+        for jd_id, _ in jds:
+            if jd_id in self.rows:
+                self.remove(jd_id)
+        indptr, indices = [0], []
+        for jd_id, text in jds:
+            skills = frozenset(extract_skills(text.lower()))
+            self.rows[jd_id] = len(self.ids)
+            self.ids.append(jd_id)
+            self.skills.append(skills)
+            self._alive.append(True)
+            indices.extend(self.skill_ids.setdefault(skill, len(self.skill_ids)) for skill in skills)
+            indptr.append(len(indices))
+        incidence = sp.csr_matrix(
+            (np.ones(len(indices)), indices, indptr), shape=(len(jds), len(self.skill_ids)))
+        self._pending.append((self.model.transform(text for _, text in jds), incidence))
+
+    def add(self, jd_id, text):
+        self.add_many([(jd_id, text)])
+
+    def remove(self, jd_id):
+        row = self.rows.pop(jd_id)
+        self._alive[row] = False
+        self._removed += 1
+        if self._removed > COMPACT_RATIO * len(self.ids):
+            self._compact()
+
+    def _compact(self):
+        tfidf, incidence = self._matrices()
+        live = [r for r in range(len(self.ids)) if self._alive[r]]
+        self.ids = [self.ids[r] for r in live]
+        self.skills = [self.skills[r] for r in live]
+        self.rows = {jd_id: i for i, jd_id in enumerate(self.ids)}
+        self._alive = [True] * len(self.ids)
+        self._tfidf, self._incidence = tfidf[live], incidence[live]
+        self._removed = 0
+
+    def _matrices(self):
+        if self._pending or self._tfidf is None:
+            self._tfidf = _stack(self._tfidf, [t for t, _ in self._pending],
+                                 len(self.model.vectorizer.vocabulary_))
+            self._incidence = _stack(self._incidence, [i for _, i in self._pending], len(self.skill_ids))
+            self._pending = []
+        return self._tfidf, self._incidence
+
+    def jds_with(self, skill):
+        """Posting list: ids of live JDs that require skill."""
+        col = self.skill_ids.get(skill)
+        if col is None:
+            return []
+        rows = self._matrices()[1][:, col].nonzero()[0]
+        return [self.ids[r] for r in rows if self._alive[r]]
+
+    # ---- queries ----
+    def scores(self, resume_text, r_skills=None):
+        """(final, k_score, c_score) arrays over every row; removed rows get final -1."""
+        r_skills = extract_skills(resume_text) if r_skills is None else r_skills
+        tfidf, incidence = self._matrices()
+        wanted = np.zeros(incidence.shape[1])
+        wanted[[self.skill_ids[s] for s in r_skills if s in self.skill_ids]] = 1
+        overlap = incidence @ wanted
+        counts = np.diff(incidence.indptr).astype(float)
+        has_skills = counts > 0
+        k_score = np.zeros(len(counts), dtype=int)
+        k_score[has_skills] = np.floor(overlap[has_skills] / counts[has_skills] * 100).astype(int)
+
+        sims = tfidf @ self.model.transform([resume_text]).toarray().ravel()
+        c_score = np.maximum((sims * 100).astype(int), MIN_C_SCORE)
+        c_score[~has_skills] = MIN_C_SCORE
+        final = np.floor(k_score * 0.6 + c_score * 0.4).astype(int)
+        final[~has_skills] = 0
+        final[~np.asarray(self._alive, dtype=bool)] = -1
+        return final, k_score, c_score
+
+    def top_k(self, resume_text, k=10):
+        """Best k JDs as dicts, ordered by final score (ties: higher context first)."""
+        r_skills = extract_skills(resume_text)
+        final, k_score, c_score = self.scores(resume_text, r_skills)
+        k = min(k, len(self))
+        if k <= 0:
+            return []
+        # Composite key so one argpartition orders by final, then context score
+        key = final * 1000 + c_score
+        idx = np.argpartition(-key, k - 1)[:k] if k < len(key) else np.arange(len(key))
+        idx = idx[np.argsort(-key[idx], kind="stable")]
+        return [{
+            "jd_id": self.ids[row],
+            "final": int(final[row]),
+            "k_score": int(k_score[row]),
+            "c_score": int(c_score[row]),
+            "matched": sorted(r_skills & self.skills[row]),
+            "missing": sorted(self.skills[row] - r_skills),
+        } for row in idx]
+
+    # ---- persistence ----
+    def save(self, path):
+        # Pickle the state, not the instance, so indexes built by running this
+        # file as a script (class lives in __main__) load anywhere
+        self._matrices()
+        with open(path, "wb") as fh:
+            pickle.dump(self.__dict__, fh, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        index = cls.__new__(cls)
+        with open(path, "rb") as fh:
+            index.__dict__.update(pickle.load(fh))
+        return index
+
+
+def main(argv=None):
+    from batch import load_documents, _prepare
+
+    parser = argparse.ArgumentParser(description="Build or query a JD index.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Index a directory or JSONL of JDs")
+    build.add_argument("--jds", required=True)
+    build.add_argument("--out", required=True)
+    query = sub.add_parser("query", help="Top-k JDs for a resume file")
+    query.add_argument("--index", required=True)
+    query.add_argument("--resume", required=True, help="Resume .pdf/.docx/.txt")
+    query.add_argument("-k", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        started = time.perf_counter()
+        docs = [doc for doc, _ in map(_prepare, load_documents(args.jds))]
+        index = JDIndex.build((jd_id, text) for jd_id, text, _ in docs)
+        index.save(args.out)
+        print(f"Indexed {len(index)} JDs in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+    else:
+        index = JDIndex.load(args.index)
+        (_, text, _), _ = _prepare(("resume", args.resume, None))
+        started = time.perf_counter()
+        results = index.top_k(text, args.k)
+        elapsed = (time.perf_counter() - started) * 1000
+        for r in results:
+            print(f"{r['final']:>4}  {r['jd_id']}  (keyword {r['k_score']}, context {r['c_score']})")
+        print(f"Query over {len(index)} JDs took {elapsed:.1f} ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# ---------------- BACKGROUND JOBS ----------------
+# One bounded pool shared by every Streamlit session:
+#   * each session (owner) has at most one live job; submitting again, or
+#     cancel(), supersedes the old one
+#   * jobs report (stage, fraction) and are cancelled cooperatively at the
+#     next report() call; long steps (PDF parsing) also poll cancelled()
+#   * when running + queued jobs reach capacity, submit() raises PoolBusy
+#     instead of queueing without bound, so one heavy upload cannot starve
+#     everyone else; a rejected submit leaves the session's own job running
+#   * finished jobs are dropped result_ttl seconds after they end, so a
+#     session that closed its tab mid-job does not keep its result forever
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class PoolBusy(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, owner, signature):
+        self.id = uuid.uuid4().hex
+        self.owner = owner
+        self.signature = signature
+        self.status = "queued"     # queued | running | done | failed | cancelled
+        self.stage = "queued"
+        self.fraction = 0.0
+        self.result = None
+        self.error = None
+        self.submitted = time.monotonic()
+        self.finished = None
+        self.future = None
+        self._cancel = threading.Event()
+
+    @property
+    def done(self):
+        return self.status in ("done", "failed", "cancelled")
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def report(self, stage, fraction):
+        """Progress callback handed to the job function; also the cancellation point."""
+        if self._cancel.is_set():
+            raise JobCancelled(stage)
+        self.stage, self.fraction = stage, fraction
+
+    def cancel(self):
+        self._cancel.set()
+        if self.future is not None and self.future.cancel():
+            self.status = "cancelled"
+            self.finished = time.monotonic()
+
+
+class JobManager:
+    def __init__(self, max_workers=4, max_queued=8, result_ttl=600):
+        self.max_workers = max_workers
+        self.capacity = max_workers + max_queued
+        self.result_ttl = result_ttl
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="careercraft-job")
+        # Re-entrant: cancelling a queued future runs _finish() synchronously
+        self._lock = threading.RLock()
+        self._by_owner = {}
+        self._active = set()
+        self.completed = self.failed = self.cancelled = self.rejected = 0
+
+    def submit(self, owner, signature, fn, *args):
+        """Run fn(report, cancelled, *args) in the pool; returns the Job or raises PoolBusy."""
+        with self._lock:
+            self._expire()
+            previous = self._by_owner.get(owner)
+            # The job this one supersedes does not count against capacity
+            in_flight = len(self._active) - (previous in self._active)
+            if in_flight >= self.capacity:
+                self.rejected += 1
+                raise PoolBusy(f"{in_flight} analyses in flight")
+            if previous is not None and not previous.done:
+                previous.cancel()
+            job = Job(owner, signature)
+            self._by_owner[owner] = job
+            self._active.add(job)
+            job.future = self._pool.submit(self._run, job, fn, args)
+        # Outside the lock: fires immediately if the future is already done
+        job.future.add_done_callback(lambda _, job=job: self._finish(job))
+        return job
+
+    def _run(self, job, fn, args):
+        try:
+            job.report("starting", 0.0)
+            job.status = "running"
+            job.result = fn(job.report, lambda: job.cancelled, *args)
+            job.stage, job.fraction, job.status = "done", 1.0, "done"
+        except JobCancelled:
+            job.status = "cancelled"
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            job.status = "failed"
+        finally:
+            job.finished = time.monotonic()
+
+    def _finish(self, job):
+        # Future done callback (ran, failed or cancelled before starting)
+        with self._lock:
+            if job not in self._active:
+                return
+            self._active.discard(job)
+            if job.status == "done":
+                self.completed += 1
+            elif job.status == "failed":
+                self.failed += 1
+            else:
+                job.status = "cancelled"
+                self.cancelled += 1
+
+    def _expire(self):
+        cutoff = time.monotonic() - self.result_ttl
+        for owner in [o for o, job in self._by_owner.items()
+                      if job.finished is not None and job.finished < cutoff]:
+            del self._by_owner[owner]
+
+    def get(self, owner):
+        return self._by_owner.get(owner)
+
+    def cancel(self, owner):
+        job = self._by_owner.get(owner)
+        if job is not None and not job.done:
+            job.cancel()
+
+    def forget(self, owner):
+        with self._lock:
+            self._by_owner.pop(owner, None)
+
+    def busy(self):
+        return len(self._active) >= self.capacity
+
+    def stats(self):
+        with self._lock:
+            return {
+                "active": len(self._active),
+                "capacity": self.capacity,
+                "workers": self.max_workers,
+                "completed": self.completed,
+                "failed": self.failed,
+                "cancelled": self.cancelled,
+                "rejected": self.rejected,
+            }
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_manager():
+    """Process-wide manager, sized by CAREERCRAFT_JOB_WORKERS / CAREERCRAFT_JOB_QUEUE;
+    finished jobs are kept CAREERCRAFT_JOB_RESULT_TTL seconds."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = JobManager(
+                max_workers=int(os.environ.get("CAREERCRAFT_JOB_WORKERS", "4")),
+                max_queued=int(os.environ.get("CAREERCRAFT_JOB_QUEUE", "8")),
+                result_ttl=float(os.environ.get("CAREERCRAFT_JOB_RESULT_TTL", "600")),
+            )
+        return _manager
@@ -0,0 +1,78 @@
+import re
+from collections import Counter
+
+# ---------------- SKILL MATCHING ENGINE ----------------
+# A text is scanned a single time, word by word, no matter how large the
+# taxonomy grows: skills are filed under their first word ("react native"
+# under "react", "node.js" under "node", "c#" under "c"), so each word of the
+# text costs one dict lookup and only the skills filed under it are compared
+# (str.startswith) at that offset. Skills that start with a symbol (".net")
+# are few and found with str.find.
+#
+# Boundary rules (per skill edge):
+#   * edge is a word char ("react", "c" in "c#")  -> no word char may touch it
+#   * edge is a symbol    ("#" in "c#", "." in ".net") -> no constraint
+# For plain alphanumeric skills this is exactly the old r'\b' + skill + r'\b'
+# check; symbol-edged skills like "c#" / ".net" now match where \b never could.
+# Overlapping skills ("react" inside "react native") are all reported.
+#
+# The state is plain dicts and lists: a pickled matcher loads without
+# compiling anything.
+
+_WORD_RUN = re.compile(r'\w+')
+
+
+def _is_word(ch):
+    return ch.isalnum() or ch == '_'
+
+
+class SkillMatcher:
+    def __init__(self, skills):
+        self.skills = sorted({s.lower() for s in skills if s})
+        # first word -> [(skill, ends with a word char), ...]
+        self._by_head = {}
+        self._symbol_headed = []
+        for skill in self.skills:
+            entry = (skill, _is_word(skill[-1]))
+            head = _WORD_RUN.match(skill)
+            if head:
+                self._by_head.setdefault(head.group(), []).append(entry)
+            else:
+                self._symbol_headed.append(entry)
+
+    def _iter(self, text):
+        n = len(text)
+        by_head = self._by_head
+        # A word-char head must sit at the start of a word of the text, and
+        # that whole word must be the skill's first word
+        for m in _WORD_RUN.finditer(text):
+            candidates = by_head.get(m.group())
+            if candidates:
+                start = m.start()
+                for skill, word_tail in candidates:
+                    end = start + len(skill)
+                    if text.startswith(skill, start) and not (word_tail and end < n and _is_word(text[end])):
+                        yield skill, start, end
+        for skill, word_tail in self._symbol_headed:
+            start = text.find(skill)
+            while start >= 0:
+                end = start + len(skill)
+                if not (word_tail and end < n and _is_word(text[end])):
+                    yield skill, start, end
+                start = text.find(skill, start + 1)
+
+    def find(self, text):
+        """Set of skills present in text (same contract as extract_skills)."""
+        return {skill for skill, _, _ in self._iter(text.lower())}
+
+    def positions(self, text):
+        """{skill: [(start, end), ...]} with offsets into text.lower()."""
+        found = {}
+        for skill, start, end in self._iter(text.lower()):
+            found.setdefault(skill, []).append((start, end))
+        for spans in found.values():
+            spans.sort()
+        return found
+
+    def counts(self, text):
+        return Counter(skill for skill, _, _ in self._iter(text.lower()))
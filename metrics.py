@@ -0,0 +1,170 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# ---------------- STAGE INSTRUMENTATION ----------------
+# Times each analysis stage and counts its inputs (pages, chars, skills...).
+#   CAREERCRAFT_METRICS=1            turn recording on
+#   CAREERCRAFT_METRICS_LOG=path     append one JSON line per run
+#   CAREERCRAFT_METRICS_PORT=9108    serve Prometheus text on /metrics
+# When off, stage() hands back one shared no-op object: a function call and
+# a flag check per stage, nothing else.
+
+LOG_PATH = os.environ.get("CAREERCRAFT_METRICS_LOG") or None
+PORT = int(os.environ.get("CAREERCRAFT_METRICS_PORT", "0") or 0)
+ENABLED = os.environ.get("CAREERCRAFT_METRICS", "") not in ("", "0") or bool(LOG_PATH or PORT)
+
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_local = threading.local()
+_histograms = {}   # stage -> [bucket counts..., +Inf count, sum]
+_counters = {}     # (stage, input) -> total
+
+
+class _NoopStage:
+    def count(self, **inputs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopStage()
+
+
+class _Stage:
+    __slots__ = ("name", "inputs", "started")
+
+    def __init__(self, name, inputs):
+        self.name = name
+        self.inputs = inputs
+
+    def count(self, **inputs):
+        self.inputs.update(inputs)
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        seconds = time.perf_counter() - self.started
+        _observe(self.name, seconds, self.inputs)
+        run = getattr(_local, "run", None)
+        if run is not None:
+            run.stages.append({"stage": self.name, "seconds": seconds, "error": exc_type is not None,
+                               **self.inputs})
+        return False
+
+
+def stage(name, **inputs):
+    """with stage("extract_skills", chars=len(text)) as s: ...; s.count(skills=n)"""
+    if not ENABLED:
+        return _NOOP
+    return _Stage(name, dict(inputs))
+
+
+def _observe(name, seconds, inputs):
+    with _lock:
+        hist = _histograms.get(name)
+        if hist is None:
+            hist = _histograms[name] = [0] * (len(BUCKETS) + 2)
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                hist[i] += 1
+        hist[-2] += 1
+        hist[-1] += seconds
+        for key, value in inputs.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                _counters[(name, key)] = _counters.get((name, key), 0) + value
+
+
+class Run:
+    def __init__(self, name):
+        self.name = name
+        self.started = time.time()
+        self.seconds = 0.0
+        self.stages = []
+
+    def as_dict(self):
+        return {"run": self.name, "started": self.started, "seconds": self.seconds, "stages": self.stages}
+
+
+@contextmanager
+def run(name):
+    """Groups the stages executed in this thread into one record (dev panel / JSONL log)."""
+    if not ENABLED:
+        yield None
+        return
+    record, previous = Run(name), getattr(_local, "run", None)
+    _local.run = record
+    started = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record.seconds = time.perf_counter() - started
+        _local.run = previous
+        if LOG_PATH and record.stages:
+            line = json.dumps(record.as_dict()) + "\n"
+            with _lock, open(LOG_PATH, "a", encoding="utf-8") as fh:
+                fh.write(line)
+
+
+def prometheus_text():
+    lines = [
+        "# HELP careercraft_stage_seconds Time spent per analysis stage.",
+        "# TYPE careercraft_stage_seconds histogram",
+    ]
+    with _lock:
+        histograms = {k: list(v) for k, v in _histograms.items()}
+        counters = dict(_counters)
+    for name, hist in sorted(histograms.items()):
+        for bound, count in zip(BUCKETS, hist):
+            lines.append(f'careercraft_stage_seconds_bucket{{stage="{name}",le="{bound}"}} {count}')
+        lines.append(f'careercraft_stage_seconds_bucket{{stage="{name}",le="+Inf"}} {hist[-2]}')
+        lines.append(f'careercraft_stage_seconds_sum{{stage="{name}"}} {hist[-1]}')
+        lines.append(f'careercraft_stage_seconds_count{{stage="{name}"}} {hist[-2]}')
+    lines += [
+        "# HELP careercraft_stage_inputs_total Inputs processed per stage (pages, chars, skills...).",
+        "# TYPE careercraft_stage_inputs_total counter",
+    ]
+    for (name, key), value in sorted(counters.items()):
+        lines.append(f'careercraft_stage_inputs_total{{stage="{name}",input="{key}"}} {value}')
+    return "\n".join(lines) + "\n"
+
+
+_server = None
+
+
+def start_http_server(port=PORT):
+    """Serve /metrics from a daemon thread (once per process)."""
+    global _server
+    if _server is not None or not port:
+        return _server
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = prometheus_text().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    with _lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer(("0.0.0.0", port), Handler)
+            except OSError:
+                return None  # another worker on this host already serves the port
+            threading.Thread(target=_server.serve_forever, daemon=True).start()
+    return _server
@@ -0,0 +1,418 @@
+import argparse
+import asyncio
+import base64
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from email.parser import BytesParser
+from email.policy import HTTP
+from urllib.parse import urlsplit
+
+from lru import LRUCache
+from text_cache import content_key
+
+# ---------------- HTTP SCORING SERVICE ----------------
+#   python service.py --port 8700 --workers 4 --context-model jd_tfidf.pkl
+#   curl -s localhost:8700/v1/score -d '{"resume_text": "...", "jd_text": "..."}'
+#   curl -s localhost:8700/v1/score -F resume_file=@cv.pdf -F jd_text="..."
+# Stdlib only: an asyncio HTTP/1.1 front end (keep-alive) in front of a
+# process pool whose workers are warmed at start-up (taxonomy matcher,
+# scikit-learn, the fitted context model). Identical requests in flight share
+# one computation, recent results are served from an LRU, and when too much
+# work is pending new requests get 503 instead of queueing without bound.
+# python -m benchmarks.load drives it and reports p50/p99 and throughput.
+
+MAX_BATCH = 1000
+CHUNK_SIZE = 16   # items per pool task; amortises IPC without starving workers
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# ---- worker side ----
+
+_MODEL = None
+
+
+def _init_worker(context_model=None, taxonomy=None):
+    global _MODEL
+    import engine
+    if taxonomy:
+        engine.configure_taxonomy(taxonomy)
+    if context_model:
+        from context_model import ContextModel
+        _MODEL = ContextModel.load(context_model)
+    # Pay the first-call costs (sklearn import, matcher, vectorizer) now
+    engine.calculate_metrics("python sql", "python java", {"python"}, {"python", "java"}, _MODEL)
+
+
+def _warm(hold):
+    time.sleep(hold)  # stay busy so the next warm task lands on another worker
+    return os.getpid()
+
+
+def _resume_text(item):
+    """(text, extraction or None); extraction errors become per-item 422s."""
+    from engine import Upload, extract_document
+    if "resume_text" in item:
+        return item["resume_text"], None
+    name, data = item["resume_file"]
+    extraction = extract_document(Upload(data, name))
+    if extraction.error:
+        raise HTTPError(422, f"Could not read {name}: {extraction.error}")
+    return extraction.text, extraction
+
+
+def _score_many(items):
+    """(taxonomy version, one result per item)."""
+    from engine import extract_skills, calculate_metrics, keyword_score, blend_score, current_taxonomy
+    version = current_taxonomy().version
+    results, prepared = [None] * len(items), []
+    for i, item in enumerate(items):
+        try:
+            prepared.append((i, item["jd_text"]) + _resume_text(item))
+        except HTTPError as e:
+            results[i] = {"error": str(e), "status": e.status}
+        except Exception as e:
+            results[i] = {"error": f"{type(e).__name__}: {e}", "status": 500}
+    c_scores = None
+    if _MODEL is not None and prepared:
+        # One transform per side for the whole chunk; row-wise dot = per-pair cosine
+        from context_model import to_c_scores
+        r = _MODEL.transform(resume for _, _, resume, _ in prepared)
+        j = _MODEL.transform(jd for _, jd, _, _ in prepared)
+        c_scores = to_c_scores(r.multiply(j).sum(axis=1).A1)
+    for n, (i, jd_text, resume_text, extraction) in enumerate(prepared):
+        try:
+            r_skills = extract_skills(resume_text)
+            j_skills = extract_skills(jd_text.lower())
+            if c_scores is None or not j_skills:
+                final, k_score, c_score = calculate_metrics(resume_text, jd_text, r_skills, j_skills)
+            else:
+                k_score, c_score = keyword_score(r_skills, j_skills), int(c_scores[n])
+                final = blend_score(k_score, c_score)
+            result = {
+                "final": final,
+                "keyword": k_score,
+                "context": c_score,
+                "matched": sorted(r_skills & j_skills),
+                "missing": sorted(j_skills - r_skills),
+            }
+            if extraction is not None:
+                result["pages"] = extraction.pages
+                result["truncated"] = extraction.truncated
+            results[i] = result
+        except Exception as e:
+            results[i] = {"error": f"{type(e).__name__}: {e}", "status": 500}
+    return version, results
+
+
+# ---- request parsing ----
+
+def _item_from_fields(fields, files):
+    """One scoring item from JSON fields (+ uploaded files for multipart)."""
+    jd_text = fields.get("jd_text")
+    if not isinstance(jd_text, str) or not jd_text.strip():
+        raise HTTPError(400, "jd_text is required")
+    item = {"jd_text": jd_text}
+    if "resume_file" in files:
+        item["resume_file"] = files["resume_file"]
+    elif isinstance(fields.get("resume_file"), dict):
+        upload = fields["resume_file"]
+        try:
+            item["resume_file"] = (str(upload["name"]), base64.b64decode(upload["data"], validate=True))
+        except (KeyError, ValueError, TypeError):
+            raise HTTPError(400, 'resume_file must be {"name": ..., "data": <base64>}') from None
+    elif isinstance(fields.get("resume_text"), str):
+        item["resume_text"] = fields["resume_text"]
+    else:
+        raise HTTPError(400, "resume_text or resume_file is required")
+    if "resume_file" in item and not item["resume_file"][0].lower().endswith((".pdf", ".docx")):
+        raise HTTPError(400, "resume_file must be a .pdf or .docx")
+    return item
+
+
+def _parse_multipart(content_type, body):
+    message = BytesParser(policy=HTTP).parsebytes(
+        b"Content-Type: " + content_type.encode("latin-1") + b"\r\n\r\n" + body)
+    if not message.is_multipart():
+        raise HTTPError(400, "Malformed multipart body")
+    fields, files = {}, {}
+    for part in message.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        if not name:
+            continue
+        payload = part.get_payload(decode=True) or b""
+        filename = part.get_filename()
+        if filename:
+            files[name] = (filename, payload)
+        else:
+            fields[name] = payload.decode(part.get_content_charset() or "utf-8", errors="replace")
+    return fields, files
+
+
+def _parse_body(headers, body):
+    content_type = headers.get("content-type", "application/json")
+    if content_type.startswith("multipart/form-data"):
+        return _parse_multipart(content_type, body)
+    try:
+        data = json.loads(body or b"{}")
+    except ValueError:
+        raise HTTPError(400, "Body must be JSON or multipart/form-data") from None
+    if not isinstance(data, dict):
+        raise HTTPError(400, "Body must be a JSON object")
+    return data, {}
+
+
+def item_key(item, taxonomy_version=None):
+    """Content hash of everything that affects the score."""
+    if "resume_text" in item:
+        resume = content_key(item["resume_text"].encode("utf-8"), "text")
+    else:
+        name, data = item["resume_file"]
+        resume = content_key(data, os.path.splitext(name)[1].lower())
+    return content_key((resume + "\0" + item["jd_text"] + "\0" + str(taxonomy_version)).encode("utf-8"))
+
+
+# ---- scheduling ----
+
+class Scorer:
+    def __init__(self, pool, workers, cache_size=4096, max_pending=2048, taxonomy_version=None):
+        self.pool = pool
+        # Part of every cache key, so a hot-reloaded taxonomy never serves
+        # results scored with the previous one
+        self.taxonomy_version = taxonomy_version or (lambda: None)
+        self.workers = workers
+        self.max_pending = max_pending
+        self.cache = LRUCache(cache_size)
+        self._inflight = {}    # key -> asyncio.Future shared by identical requests
+        self._tasks = set()    # running _dispatch tasks; the loop only keeps weak references
+        self.pending = 0
+        self.requests = self.items = self.coalesced = self.dispatched = self.rejected = 0
+
+    async def score(self, items):
+        loop = asyncio.get_running_loop()
+        self.items += len(items)
+        keys, ready, fresh = [], {}, {}
+        version = self.taxonomy_version()
+        for item in items:
+            key = item_key(item, version)
+            keys.append(key)
+            if key in ready or key in fresh:
+                continue
+            cached = self.cache.get(key)
+            if cached is not None:
+                ready[key] = cached
+            elif key in self._inflight:
+                self.coalesced += 1
+            else:
+                fresh[key] = item
+        if len(fresh) > self.max_pending:
+            raise HTTPError(413, f"{len(fresh)} new items exceed --max-pending ({self.max_pending})")
+        if self.pending + len(fresh) > self.max_pending:
+            self.rejected += 1
+            raise HTTPError(503, f"{self.pending} items pending; retry shortly")
+        for key in fresh:
+            self._inflight[key] = loop.create_future()
+        todo = list(fresh.items())
+        self.pending += len(todo)
+        self.dispatched += len(todo)
+        for start in range(0, len(todo), CHUNK_SIZE):
+            task = loop.create_task(self._dispatch(todo[start:start + CHUNK_SIZE], version))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        shared = {key: self._inflight[key] for key in keys if key not in ready}
+        # shield: a client that disconnects must not cancel work others share
+        done = await asyncio.gather(*(asyncio.shield(f) for f in shared.values()))
+        ready.update(zip(shared, done))
+        return [ready[key] for key in keys]
+
+    async def _dispatch(self, chunk, version):
+        loop = asyncio.get_running_loop()
+        try:
+            scored_with, results = await loop.run_in_executor(self.pool, _score_many, [item for _, item in chunk])
+        except Exception as e:
+            scored_with, results = None, [{"error": f"{type(e).__name__}: {e}", "status": 500}] * len(chunk)
+        finally:
+            self.pending -= len(chunk)
+        for (key, _), result in zip(chunk, results):
+            # A worker that has not picked up a reload yet answers, but is not cached
+            if "error" not in result and scored_with == version:
+                self.cache.put(key, result)
+            self._inflight.pop(key).set_result(result)
+
+    def stats(self):
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "inflight_keys": len(self._inflight),
+            "requests": self.requests,
+            "items": self.items,
+            "dispatched": self.dispatched,
+            "coalesced": self.coalesced,
+            "rejected": self.rejected,
+            "cache": self.cache.stats(),
+        }
+
+
+# ---- HTTP ----
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 422: "Unprocessable Entity", 500: "Internal Server Error",
+           503: "Service Unavailable"}
+
+
+class ScoringService:
+    def __init__(self, scorer, max_body_bytes):
+        self.scorer = scorer
+        self.max_body_bytes = max_body_bytes
+
+    async def route(self, method, path, headers, body):
+        if path == "/health":
+            return 200, {"status": "ok"}
+        if path == "/stats":
+            return 200, self.scorer.stats()
+        if path not in ("/v1/score", "/v1/score/batch"):
+            raise HTTPError(404, f"No route for {path}")
+        if method != "POST":
+            raise HTTPError(405, "Use POST")
+        self.scorer.requests += 1
+        fields, files = _parse_body(headers, body)
+        if path == "/v1/score":
+            result, = await self.scorer.score([_item_from_fields(fields, files)])
+            if "error" in result:
+                raise HTTPError(result["status"], result["error"])
+            return 200, result
+        raw = fields.get("items")
+        if not isinstance(raw, list) or not raw:
+            raise HTTPError(400, "items must be a non-empty list")
+        if len(raw) > MAX_BATCH:
+            raise HTTPError(413, f"At most {MAX_BATCH} items per batch")
+        items = []
+        for i, entry in enumerate(raw):
+            if not isinstance(entry, dict):
+                raise HTTPError(400, f"items[{i}] must be an object")
+            try:
+                items.append(_item_from_fields(entry, {}))
+            except HTTPError as e:
+                raise HTTPError(e.status, f"items[{i}]: {e}") from None
+        results = await self.scorer.score(items)
+        # Per-item errors stay in their slot; the batch itself succeeded
+        return 200, {"results": [{k: v for k, v in r.items() if k != "status"} for r in results]}
+
+    async def _read_request(self, reader):
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, _ = line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise HTTPError(400, "Malformed request line") from None
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if "chunked" in headers.get("transfer-encoding", ""):
+            raise HTTPError(400, "Chunked request bodies are not supported; send Content-Length")
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length > self.max_body_bytes:
+            raise HTTPError(413, f"Body over {self.max_body_bytes} bytes")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), urlsplit(target).path, headers, body
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                keep_alive = True
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    method, path, headers, body = request
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                    status, payload = await self.route(method, path, headers, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                    keep_alive = keep_alive and e.status not in (400, 413)
+                except Exception as e:
+                    status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+                data = json.dumps(payload).encode()
+                head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                        f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n")
+                if status == 503:
+                    head += "Retry-After: 1\r\n"
+                writer.write((head + "\r\n").encode("latin-1") + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+def start_pool(workers, context_model=None, taxonomy=None):
+    """Process pool with every worker started and warmed before the first request."""
+    if context_model and not os.path.exists(context_model):
+        raise SystemExit(f"Context model not found: {context_model} (fit one with batch.py --context-model)")
+    pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(context_model, taxonomy))
+    pids, deadline = set(), time.monotonic() + 300
+    while len(pids) < workers and time.monotonic() < deadline:
+        pids.update(pool.map(_warm, [0.1] * workers))
+    return pool, pids
+
+
+async def serve(host, port, pool, workers, cache_size, max_pending, max_body_bytes, taxonomy_version=None):
+    service = ScoringService(Scorer(pool, workers, cache_size, max_pending, taxonomy_version), max_body_bytes)
+    server = await asyncio.start_server(service.handle, host, port, backlog=1024)
+    print(f"Scoring service on http://{host}:{port} ({workers} warm workers)", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve resume/JD scoring over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8700)
+    parser.add_argument("--workers", type=int, default=None, help="Scoring processes (default: all cores)")
+    parser.add_argument("--context-model", help="Fitted TF-IDF model (see batch.py); default: pairwise context")
+    parser.add_argument("--taxonomy", help="Taxonomy source (.json/.yaml/.csv); default: built-in")
+    parser.add_argument("--cache-size", type=int, default=4096, help="Recent results kept (entries)")
+    parser.add_argument("--max-pending", type=int, default=2048, help="Queued items before answering 503")
+    parser.add_argument("--max-body-mb", type=float, default=64)
+    args = parser.parse_args(argv)
+
+    import engine
+    # Loaded here too, only to key the result cache by the taxonomy version
+    engine.configure_taxonomy(args.taxonomy)
+    workers = args.workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    pool, pids = start_pool(workers, args.context_model, args.taxonomy)
+    print(f"Warmed {len(pids)} workers in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+    try:
+        asyncio.run(serve(args.host, args.port, pool, workers, args.cache_size, args.max_pending,
+                          int(args.max_body_mb * 2**20), lambda: engine.current_taxonomy().version))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.shutdown(cancel_futures=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
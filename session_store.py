@@ -0,0 +1,199 @@
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from text_cache import content_key
+
+# ---------------- SHARED SESSION STORE ----------------
+# Large per-session values (resume / JD text) live here once per process,
+# keyed by content hash; st.session_state only keeps small things (hashes,
+# scores, flags). Two sessions analysing the same preset JD share one copy.
+#   * byte budget with LRU eviction; values no session points at go first,
+#     and put() never evicts the writing session's own values, so an
+#     analysis larger than the budget is kept alone rather than dropped on
+#     arrival
+#   * sessions idle longer than idle_seconds are dropped by expire_idle()
+#   * stats() reports total and per-session memory
+
+
+def value_key(value):
+    return content_key(value.encode("utf-8") if isinstance(value, str) else bytes(value))
+
+
+class _Session:
+    __slots__ = ("slots", "seen")
+
+    def __init__(self, now):
+        self.slots = {}   # name -> value key
+        self.seen = now
+
+
+class SessionStore:
+    def __init__(self, max_bytes=256 * 2**20, idle_seconds=1800, sweep_interval=60):
+        self.max_bytes = max_bytes
+        self.idle_seconds = idle_seconds
+        self.sweep_interval = sweep_interval
+        self._values = OrderedDict()   # key -> value, least recently used first
+        self._sizes = {}
+        self._refs = {}                # key -> number of session slots pointing at it
+        self._sessions = {}
+        self._bytes = 0
+        self._swept = time.monotonic()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.shared = self.evictions = self.expired = 0
+
+    def _session(self, session, now):
+        s = self._sessions.get(session)
+        if s is None:
+            s = self._sessions[session] = _Session(now)
+        s.seen = now
+        return s
+
+    def put(self, session, name, value):
+        """Point session's slot `name` at value (stored once per content); returns its key."""
+        key = value_key(value)
+        size = sys.getsizeof(value)
+        with self._lock:
+            s = self._session(session, time.monotonic())
+            if key in self._values:
+                self._values.move_to_end(key)
+                self.shared += 1
+            else:
+                self._values[key] = value
+                self._sizes[key] = size
+                self._refs[key] = 0
+                self._bytes += size
+            old = s.slots.get(name)
+            if old != key:
+                s.slots[name] = key
+                self._refs[key] += 1
+                if old is not None:
+                    self._release(old)
+            self._evict(keep=set(s.slots.values()))
+        return key
+
+    def get(self, session, name, default=None):
+        with self._lock:
+            s = self._sessions.get(session)
+            key = s.slots.get(name) if s is not None else None
+            if key is None or key not in self._values:
+                self.misses += 1
+                return default
+            s.seen = time.monotonic()
+            self._values.move_to_end(key)
+            self.hits += 1
+            return self._values[key]
+
+    def touch(self, session):
+        with self._lock:
+            s = self._sessions.get(session)
+            if s is not None:
+                s.seen = time.monotonic()
+
+    def drop(self, session):
+        with self._lock:
+            self._drop(session)
+
+    def _drop(self, session):
+        s = self._sessions.pop(session, None)
+        if s is not None:
+            for key in s.slots.values():
+                self._release(key)
+
+    def _release(self, key):
+        if key in self._refs:
+            self._refs[key] -= 1
+
+    def _remove(self, key):
+        del self._values[key]
+        self._bytes -= self._sizes.pop(key)
+        self._refs.pop(key)
+        self.evictions += 1
+
+    def _evict(self, keep=()):
+        if self._bytes <= self.max_bytes:
+            return
+        # Unreferenced values first, oldest first
+        for key in [k for k in self._values if not self._refs[k] and k not in keep]:
+            self._remove(key)
+            if self._bytes <= self.max_bytes:
+                return
+        # Still over budget: take live values from the least recently used
+        # end; their sessions see a miss and have to re-run the analysis
+        for key in [k for k in self._values if k not in keep]:
+            if self._bytes <= self.max_bytes:
+                return
+            for s in self._sessions.values():
+                for name in [n for n, k in s.slots.items() if k == key]:
+                    del s.slots[name]
+            self._remove(key)
+
+    def expire_idle(self, force=False):
+        """Drop sessions idle longer than idle_seconds; returns their ids.
+
+        Scans at most once per sweep_interval unless force is set, so it is
+        cheap to call on every rerun.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._swept < self.sweep_interval:
+                return []
+            self._swept = now
+            idle = [sid for sid, s in self._sessions.items() if now - s.seen > self.idle_seconds]
+            for sid in idle:
+                self._drop(sid)
+            self.expired += len(idle)
+            # Nothing points at these any more; keep them only while under budget
+            self._evict()
+            return idle
+
+    def session_bytes(self, session):
+        with self._lock:
+            s = self._sessions.get(session)
+            return sum(self._sizes.get(k, 0) for k in s.slots.values()) if s is not None else 0
+
+    def stats(self, top=10):
+        """Totals, plus the `top` sessions by bytes referenced (shared values count for each)."""
+        now = time.monotonic()
+        with self._lock:
+            per_session = {
+                sid: {"bytes": sum(self._sizes.get(k, 0) for k in s.slots.values()),
+                      "slots": len(s.slots), "idle_seconds": round(now - s.seen, 1)}
+                for sid, s in self._sessions.items()
+            }
+            referenced = sum(v["bytes"] for v in per_session.values())
+            lookups = self.hits + self.misses
+            return {
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "values": len(self._values),
+                "unreferenced": sum(1 for n in self._refs.values() if not n),
+                "sessions": len(self._sessions),
+                # What per-session copies would have cost
+                "referenced_bytes": referenced,
+                "hits": self.hits,
+                "misses": self.misses,
+                "shared": self.shared,
+                "evictions": self.evictions,
+                "expired_sessions": self.expired,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "top_sessions": dict(sorted(per_session.items(), key=lambda kv: -kv[1]["bytes"])[:top]),
+            }
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_session_store():
+    """Process-wide store, sized by CAREERCRAFT_SESSION_STORE_MB / CAREERCRAFT_SESSION_IDLE_MINUTES."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SessionStore(
+                max_bytes=int(os.environ.get("CAREERCRAFT_SESSION_STORE_MB", "256")) * 2**20,
+                idle_seconds=float(os.environ.get("CAREERCRAFT_SESSION_IDLE_MINUTES", "30")) * 60,
+            )
+        return _store
@@ -0,0 +1,140 @@
+import numpy as np
+
+# ---------------- BITSET SKILL VECTORS ----------------
+# Every taxonomy skill gets a bit; a skill set becomes one row of uint64
+# words and a cohort becomes an (n, words) matrix. Matched / missing are
+# & and & ~, k_score and coverage are popcounts, so thousands of resumes
+# against many roles are a handful of array operations instead of Python
+# set arithmetic per pair.
+
+_BYTE_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def popcount(bits):
+    """Set bits per row of a uint64 array (summed over the last axis)."""
+    bits = np.ascontiguousarray(bits, dtype=np.uint64)
+    if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+        return np.bitwise_count(bits).sum(axis=-1, dtype=np.int64)
+    per_byte = _BYTE_POPCOUNT[bits.view(np.uint8)]
+    return per_byte.reshape(bits.shape[:-1] + (-1,)).sum(axis=-1, dtype=np.int64)
+
+
+class SkillSpace:
+    def __init__(self, categories):
+        """categories: {category: [skill, ...]} as in SKILL_DB."""
+        self.skills = []
+        self.index = {}
+        self.category_of = []
+        for category, skills in categories.items():
+            for skill in skills:
+                if skill not in self.index:
+                    self.index[skill] = len(self.skills)
+                    self.skills.append(skill)
+                    self.category_of.append(category)
+        self.categories = list(categories)
+        self.words = max(1, -(-len(self.skills) // 64))
+        self.category_masks = self.encode_many(categories[c] for c in self.categories)
+
+    def __len__(self):
+        return len(self.skills)
+
+    def encode(self, skills):
+        """One skill set -> (words,) uint64 row; skills outside the taxonomy are ignored."""
+        row = np.zeros(self.words, dtype=np.uint64)
+        for skill in skills:
+            i = self.index.get(skill)
+            if i is not None:
+                row[i >> 6] |= np.uint64(1 << (i & 63))
+        return row
+
+    def encode_many(self, skill_sets):
+        """Iterable of skill sets -> (n, words) uint64 matrix."""
+        rows, cols, n = [], [], 0
+        for n, skills in enumerate(skill_sets, 1):
+            for skill in skills:
+                i = self.index.get(skill)
+                if i is not None:
+                    rows.append(n - 1)
+                    cols.append(i)
+        dense = np.zeros((n, self.words * 64), dtype=bool)
+        dense[rows, cols] = True
+        return self.pack(dense)
+
+    def pack(self, dense):
+        """(n, n_skills or more) bool -> (n, words) uint64."""
+        dense = np.asarray(dense, dtype=bool)
+        padded = np.zeros((dense.shape[0], self.words * 64), dtype=bool)
+        padded[:, :dense.shape[1]] = dense
+        return np.packbits(padded, axis=1, bitorder="little").view(np.uint64)
+
+    def unpack(self, bits):
+        """(n, words) uint64 -> (n, n_skills) bool."""
+        bits = np.ascontiguousarray(np.atleast_2d(bits), dtype=np.uint64)
+        dense = np.unpackbits(bits.view(np.uint8), axis=1, bitorder="little")
+        return dense[:, :len(self.skills)].astype(bool)
+
+    def decode(self, row):
+        """(words,) uint64 row -> frozenset of skill names."""
+        return frozenset(self.skills[i] for i in np.flatnonzero(self.unpack(row)[0]))
+
+    def category_coverage(self, resumes, jds=None):
+        """Fraction of each category's skills present, shape (n, n_categories).
+
+        With jds (one row, or one row per resume) the denominator is what the
+        JD asks for in that category instead of the whole category; NaN where
+        it asks for nothing.
+        """
+        resumes = np.atleast_2d(resumes)
+        masks = self.category_masks[None, :, :]
+        if jds is None:
+            wanted = masks
+        else:
+            wanted = np.atleast_2d(jds)[:, None, :] & masks
+        have = popcount(resumes[:, None, :] & wanted)
+        total = popcount(wanted)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(total > 0, have / np.maximum(total, 1), np.nan if jds is not None else 0.0)
+
+    def missing_counts(self, resumes, jds):
+        """Per skill: number of (resume, JD) pairs where the JD wants it and the resume lacks it."""
+        lacking = (~self.unpack(resumes)).sum(axis=0)
+        wanted = self.unpack(jds).sum(axis=0)
+        return lacking * wanted
+
+    def most_missing(self, resumes, jds, top=10):
+        counts = self.missing_counts(resumes, jds)
+        order = np.argsort(-counts, kind="stable")[:top]
+        return [(self.skills[i], int(counts[i])) for i in order if counts[i]]
+
+
+def matched(resumes, jds):
+    """Row-wise (or broadcast) intersection."""
+    return np.asarray(resumes, dtype=np.uint64) & np.asarray(jds, dtype=np.uint64)
+
+
+def missing(resumes, jds):
+    """Skills the JD asks for that the resume lacks."""
+    return np.asarray(jds, dtype=np.uint64) & ~np.asarray(resumes, dtype=np.uint64)
+
+
+def k_scores(resumes, jds, max_bytes=64 * 2**20):
+    """Keyword score for every resume x JD pair, shape (n_resumes, n_jds).
+
+    Same integer as engine.keyword_score; 0 where the JD has no skills (what
+    calculate_metrics returns). Resumes are processed in blocks sized so the
+    temporaries (the (block, n_jds, words) uint64 intersection plus a few
+    (block, n_jds) score arrays) stay within about max_bytes; a block is
+    never less than one resume.
+    """
+    resumes, jds = np.atleast_2d(resumes), np.atleast_2d(jds)
+    wanted = popcount(jds)
+    out = np.zeros((resumes.shape[0], jds.shape[0]), dtype=np.int64)
+    row_bytes = jds.shape[0] * (jds.shape[1] + 3) * 8
+    block_size = max(1, max_bytes // max(row_bytes, 1))
+    for start in range(0, resumes.shape[0], block_size):
+        block = resumes[start:start + block_size]
+        hits = popcount(block[:, None, :] & jds[None, :, :])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            scores = (hits / wanted) * 100
+        out[start:start + block_size] = np.where(wanted > 0, scores, 0).astype(np.int64)
+    return out
@@ -0,0 +1,274 @@
+import argparse
+import csv
+import hashlib
+import io
+import json
+import mmap
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import time
+
+from matcher import SkillMatcher
+
+# ---------------- SKILL TAXONOMY ----------------
+# A taxonomy source file (JSON, YAML or CSV) is compiled once into a pickled
+# artifact holding the canonical skill table, the alias map, the content
+# dicts (blueprints, interview questions, resume bullets) and the compiled
+# matcher:
+#   python taxonomy.py compile skills.yaml        -> skills.taxonomy.pkl
+# load_taxonomy() reuses the artifact while it matches the source's hash and
+# recompiles it otherwise. Loading is an mmap + unpickle of plain dicts and
+# lists, nothing is compiled (a few ms for 5000 skills); batch workers forked
+# after the load share it copy-on-write. TaxonomyFile re-checks the source's
+# mtime so edits go live without a redeploy.
+#
+# JSON / YAML:
+#   {"categories": {"DevOps": ["docker", {"name": "kubernetes", "aliases": ["k8s"]}]},
+#    "aliases": {"postgres": "postgresql"},
+#    "project_blueprints": {...}, "interview_questions": {...}, "resume_bullets": {...}}
+# CSV: skill,category,aliases   (aliases separated by "|")
+# Content sections a source leaves out are taken from the built-in ones.
+
+ARTIFACT_VERSION = 3
+CONTENT_SECTIONS = ("project_blueprints", "interview_questions", "resume_bullets")
+
+
+class TaxonomyError(Exception):
+    pass
+
+
+class Taxonomy:
+    def __init__(self, categories, aliases=None, project_blueprints=None, interview_questions=None,
+                 resume_bullets=None, version=None):
+        self.categories = {}
+        seen = set()
+        for category, skills in categories.items():
+            names = [s.strip().lower() for s in skills if s and s.strip()]
+            self.categories[category] = [s for s in names if not (s in seen or seen.add(s))]
+        self.skills = [s for skills in self.categories.values() for s in skills]
+        # Aliases that are themselves canonical skills, or point nowhere, are dropped
+        self.aliases = {}
+        for alias, canonical in (aliases or {}).items():
+            alias, canonical = alias.strip().lower(), canonical.strip().lower()
+            if canonical in seen and alias not in seen and alias:
+                self.aliases[alias] = canonical
+        self.project_blueprints = project_blueprints
+        self.interview_questions = interview_questions
+        self.resume_bullets = resume_bullets
+        self.version = version or _fingerprint(self.categories, self.aliases)
+        self.matcher = SkillMatcher(self.skills + list(self.aliases))
+        self._space = None
+
+    def __len__(self):
+        return len(self.skills)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['_space'] = None
+        return state
+
+    def canonical(self, skill):
+        skill = skill.lower()
+        return self.aliases.get(skill, skill)
+
+    def find(self, text):
+        """Canonical names of the skills in text; aliases count as their skill."""
+        aliases = self.aliases
+        return {aliases.get(s, s) for s in self.matcher.find(text)}
+
+    def space(self):
+        """Bit positions for skill_vectors (built on first use)."""
+        if self._space is None:
+            from skill_vectors import SkillSpace
+            self._space = SkillSpace(self.categories)
+        return self._space
+
+    def with_defaults(self, base):
+        """Fill the content sections this taxonomy does not define from base."""
+        for section in CONTENT_SECTIONS:
+            if getattr(self, section) is None:
+                setattr(self, section, getattr(base, section))
+        return self
+
+
+def _fingerprint(categories, aliases):
+    return hashlib.sha256(json.dumps([categories, aliases], sort_keys=True).encode()).hexdigest()[:16]
+
+
+# ---- sources ----
+
+def _from_mapping(data):
+    categories, aliases = {}, dict(data.get("aliases") or {})
+    for category, entries in (data.get("categories") or {}).items():
+        skills = categories.setdefault(category, [])
+        for entry in entries:
+            if isinstance(entry, dict):
+                skills.append(entry["name"])
+                for alias in entry.get("aliases") or ():
+                    aliases[alias] = entry["name"]
+            else:
+                skills.append(entry)
+    return categories, aliases, {s: data.get(s) for s in CONTENT_SECTIONS}
+
+
+def _from_csv(text):
+    categories, aliases = {}, {}
+    for row in csv.DictReader(io.StringIO(text)):
+        skill = (row.get("skill") or "").strip()
+        if not skill:
+            continue
+        categories.setdefault((row.get("category") or "Other").strip(), []).append(skill)
+        for alias in (row.get("aliases") or "").split("|"):
+            if alias.strip():
+                aliases[alias] = skill
+    return categories, aliases, {}
+
+
+def parse_source(data, kind):
+    """Source bytes + extension -> Taxonomy (content sections may be None)."""
+    text = data.decode("utf-8-sig")
+    try:
+        if kind == ".json":
+            categories, aliases, content = _from_mapping(json.loads(text))
+        elif kind in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError:
+                raise TaxonomyError("YAML taxonomies need PyYAML (pip install pyyaml)") from None
+            categories, aliases, content = _from_mapping(yaml.safe_load(text) or {})
+        elif kind == ".csv":
+            categories, aliases, content = _from_csv(text)
+        else:
+            raise TaxonomyError(f"Unsupported taxonomy format: {kind}")
+    except TaxonomyError:
+        raise
+    except Exception as e:
+        raise TaxonomyError(f"Invalid taxonomy source: {type(e).__name__}: {e}") from e
+    if not categories:
+        raise TaxonomyError("Taxonomy source defines no skills")
+    return Taxonomy(categories, aliases, version=hashlib.sha256(data).hexdigest()[:16], **content)
+
+
+# ---- artifact ----
+
+def artifact_path(source):
+    return os.path.splitext(source)[0] + ".taxonomy.pkl"
+
+
+def compile_taxonomy(source, artifact=None):
+    """Parse source and write the compiled artifact; returns the Taxonomy."""
+    with open(source, "rb") as fh:
+        data = fh.read()
+    taxonomy = parse_source(data, os.path.splitext(source)[1].lower())
+    artifact = artifact or artifact_path(source)
+    header = {"version": ARTIFACT_VERSION, "source_sha256": hashlib.sha256(data).hexdigest()}
+    # Write-then-rename so concurrent loaders never see a partial file
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(artifact)), suffix=".tmp")
+    with os.fdopen(fd, "wb") as fh:
+        # State only, not the instance: the CLI runs as __main__, whose classes
+        # would not resolve when the app loads the artifact
+        pickle.dump((header, taxonomy.__getstate__()), fh, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, artifact)
+    return taxonomy
+
+
+def read_artifact(artifact):
+    """(header, Taxonomy) from a compiled artifact."""
+    with open(artifact, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        header, state = pickle.loads(mm)
+    taxonomy = Taxonomy.__new__(Taxonomy)
+    taxonomy.__dict__.update(state)
+    return header, taxonomy
+
+
+def load_taxonomy(source, artifact=None):
+    """Compiled taxonomy for source, recompiling the artifact if it is missing or stale."""
+    artifact = artifact or artifact_path(source)
+    with open(source, "rb") as fh:
+        digest = hashlib.sha256(fh.read()).hexdigest()
+    try:
+        header, taxonomy = read_artifact(artifact)
+        if header == {"version": ARTIFACT_VERSION, "source_sha256": digest}:
+            return taxonomy
+    except (OSError, ValueError, pickle.UnpicklingError, EOFError, AttributeError):
+        pass
+    return compile_taxonomy(source, artifact)
+
+
+class TaxonomyFile:
+    """The current taxonomy for a source file, reloaded when the file changes.
+
+    The source is stat()ed at most every check_interval seconds. A reload that
+    fails (e.g. a half-saved edit) keeps serving the previous taxonomy and
+    records the error in last_error.
+    """
+
+    def __init__(self, source, check_interval=2.0, defaults=None):
+        self.source = source
+        self.check_interval = check_interval
+        self.defaults = defaults
+        self.last_error = None
+        self.reloads = 0
+        self._lock = threading.Lock()
+        self._stamp = self._stat()
+        self._checked = time.monotonic()
+        self._taxonomy = self._load()
+
+    def _stat(self):
+        st = os.stat(self.source)
+        return st.st_mtime_ns, st.st_size
+
+    def _load(self):
+        taxonomy = load_taxonomy(self.source)
+        return taxonomy.with_defaults(self.defaults) if self.defaults is not None else taxonomy
+
+    def get(self):
+        now = time.monotonic()
+        if now - self._checked < self.check_interval:
+            return self._taxonomy
+        with self._lock:
+            if now - self._checked >= self.check_interval:
+                self._checked = now
+                try:
+                    stamp = self._stat()
+                    if stamp != self._stamp:
+                        self._taxonomy = self._load()
+                        self._stamp = stamp
+                        self.reloads += 1
+                        self.last_error = None
+                except (OSError, TaxonomyError) as e:
+                    self.last_error = f"{type(e).__name__}: {e}"
+        return self._taxonomy
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile a skill taxonomy into a fast-loading artifact.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("compile", help="source (.json/.yaml/.csv) -> .taxonomy.pkl")
+    build.add_argument("source")
+    build.add_argument("--out", help="Artifact path (default: next to the source)")
+    show = sub.add_parser("check", help="Load a source and print what it resolves to")
+    show.add_argument("source")
+    show.add_argument("--text", help="Also list the canonical skills found in this text")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    if args.command == "compile":
+        taxonomy = compile_taxonomy(args.source, args.out)
+        print(f"Compiled {len(taxonomy)} skills, {len(taxonomy.aliases)} aliases, "
+              f"{len(taxonomy.categories)} categories in {time.perf_counter() - started:.2f}s "
+              f"-> {args.out or artifact_path(args.source)}", file=sys.stderr)
+    else:
+        taxonomy = load_taxonomy(args.source)
+        print(f"Loaded {len(taxonomy)} skills, {len(taxonomy.aliases)} aliases "
+              f"(version {taxonomy.version}) in {(time.perf_counter() - started) * 1000:.1f} ms")
+        if args.text:
+            print(", ".join(sorted(taxonomy.find(args.text))))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())